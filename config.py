@@ -4,14 +4,37 @@ Handles all settings and environment variables
 """
 
 import os
-from typing import Optional
+from types import MappingProxyType
+from typing import ClassVar, Mapping, Optional
+
+from dotenv import load_dotenv
 
 
 class Config:
-    """Configuration class for the bot"""
+    """Configuration class for the bot (one shared instance per process)"""
+
+    _instance: Optional["Config"] = None
+    _validated: ClassVar[bool] = False
+
+    def __new__(cls):
+        """Return the shared configuration instance"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    @classmethod
+    def get_instance(cls) -> "Config":
+        """Get the shared configuration instance"""
+        return cls()
 
     def __init__(self):
         """Initialize configuration and check environment variables"""
+        if self._initialized:
+            return
+
+        # Load variables from .env (does not override the real environment)
+        load_dotenv()
 
         # Telegram Bot Token
         self.TELEGRAM_TOKEN = self._get_env_var("TELEGRAM_BOT_TOKEN")
@@ -31,15 +54,41 @@ class Config:
 
         # OpenAI settings
         self.OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
+        # Cheaper model tried first for intent classification
+        self.OPENAI_INTENT_MODEL = os.getenv("OPENAI_INTENT_MODEL", "gpt-4o-mini")
+        # Below this confidence the intent is re-analysed with OPENAI_MODEL
+        self.OPENAI_INTENT_MIN_CONFIDENCE = float(os.getenv("OPENAI_INTENT_MIN_CONFIDENCE", "0.7"))
         self.OPENAI_MAX_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "1000"))
         self.OPENAI_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
 
         # Telegram settings
         self.TELEGRAM_TIMEOUT = int(os.getenv("TELEGRAM_TIMEOUT", "30"))
+        # Public HTTPS base URL for webhook mode; long polling is used when empty
+        self.WEBHOOK_URL = os.getenv("WEBHOOK_URL", "").rstrip("/")
+        self.WEBHOOK_PORT = int(os.getenv("PORT", "8443"))
+        self.WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET") or None
 
         # Validate required environment variables
         self._validate_config()
 
+        # Pre-built API headers (environment does not change at runtime); read-only because
+        # every client shares the same objects
+        self._notion_headers = MappingProxyType({
+            "Authorization": f"Bearer {self.NOTION_TOKEN}",
+            "Content-Type": "application/json",
+            "Notion-Version": "2022-06-28"
+        })
+        self._openai_headers = MappingProxyType({
+            "Authorization": f"Bearer {self.OPENAI_API_KEY}",
+            "Content-Type": "application/json"
+        })
+        # Multipart uploads set their own Content-Type (with the boundary)
+        self._openai_upload_headers = MappingProxyType({
+            "Authorization": f"Bearer {self.OPENAI_API_KEY}"
+        })
+
+        self._initialized = True
+
     def _get_env_var(self, var_name: str) -> str:
         """Get environment variable with validation"""
         value = os.getenv(var_name)
@@ -48,7 +97,10 @@ class Config:
         return value
 
     def _validate_config(self) -> None:
-        """Check configuration validity"""
+        """Check configuration validity (only once per process)"""
+        if Config._validated:
+            return
+
         required_vars = [
             "TELEGRAM_TOKEN",
             "OPENAI_API_KEY",
@@ -56,10 +108,7 @@ class Config:
             "NOTION_DATABASE_ID"
         ]
 
-        missing_vars = []
-        for var in required_vars:
-            if not hasattr(self, var) or not getattr(self, var):
-                missing_vars.append(var)
+        missing_vars = [var for var in required_vars if not getattr(self, var, None)]
 
         if missing_vars:
             raise ValueError(
@@ -67,30 +116,30 @@ class Config:
                 f"Please create a .env file or set the environment variables manually."
             )
 
-    def get_notion_headers(self) -> dict:
+        Config._validated = True
+
+    def get_notion_headers(self) -> Mapping[str, str]:
         """Get headers for Notion API"""
-        return {
-            "Authorization": f"Bearer {self.NOTION_TOKEN}",
-            "Content-Type": "application/json",
-            "Notion-Version": "2022-06-28"
-        }
+        return self._notion_headers
 
-    def get_openai_headers(self) -> dict:
+    def get_openai_headers(self) -> Mapping[str, str]:
         """Get headers for OpenAI API"""
-        return {
-            "Authorization": f"Bearer {self.OPENAI_API_KEY}",
-            "Content-Type": "application/json"
-        }
+        return self._openai_headers
+
+    def get_openai_upload_headers(self) -> Mapping[str, str]:
+        """Get headers for OpenAI multipart uploads (no Content-Type)"""
+        return self._openai_upload_headers
 
     def __str__(self) -> str:
         """String representation of configuration (without secrets)"""
-        return f"""
+        return f"""\
 Peruquois Bot Configuration:
 - Debug mode: {self.DEBUG}
 - Logging level: {self.LOG_LEVEL}
 - OpenAI model: {self.OPENAI_MODEL}
+- OpenAI intent model: {self.OPENAI_INTENT_MODEL} (min confidence {self.OPENAI_INTENT_MIN_CONFIDENCE})
 - OpenAI max tokens: {self.OPENAI_MAX_TOKENS}
 - OpenAI temperature: {self.OPENAI_TEMPERATURE}
 - Telegram timeout: {self.TELEGRAM_TIMEOUT}
-- Notion Database ID: {self.NOTION_DATABASE_ID[:8]}...
-        """.strip()
+- Telegram updates: {f"webhook {self.WEBHOOK_URL} (port {self.WEBHOOK_PORT})" if self.WEBHOOK_URL else "long polling"}
+- Notion Database ID: {self.NOTION_DATABASE_ID[:8]}..."""
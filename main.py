@@ -4,15 +4,26 @@ Telegram Bot for Peruquois — Personal assistant for project management
 Integrates with the Notion API for project handling and the OpenAI API for natural-language processing
 """
 
-import os
+import atexit
 import logging
 import asyncio
-from datetime import datetime
-from typing import Optional, Dict, Any
-
+import queue
+import re
+import time
+from collections import deque
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from types import MappingProxyType
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Deque, Final, Mapping
+
+import aiohttp
 from telegram import Update, Message, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import ParseMode
+from telegram.helpers import escape_markdown
 from telegram.ext import (
+    AIORateLimiter,
     Application,
+    BaseUpdateProcessor,
     CommandHandler,
     MessageHandler,
     CallbackQueryHandler,
@@ -22,26 +33,32 @@ from telegram.ext import (
 
 from config import Config
 from notion_api import NotionAPI
-from openai_api import OpenAIAPI
-
-# Logging setup
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
+from openai_api import OpenAIAPI, RESPONSE_FALLBACK, normalize_intent
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows; fall back to the default loop
+    uvloop = None
+
+# Logging setup: records are queued and written by a background listener thread,
+# so handlers never block the event loop on stream I/O
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 )
-logger = logging.getLogger(__name__)
+_log_listener = QueueListener(_log_queue, _log_stream_handler)
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(QueueHandler(_log_queue))
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
-class PeruquoisBot:
-    """Main Telegram bot class for Peruquois"""
+logger = logging.getLogger(__name__)
 
-    def __init__(self):
-        self.config = Config()
-        self.notion = NotionAPI()
-        self.openai = OpenAIAPI()
+# ---------- Static texts ----------
 
-    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """Handler for /start command"""
-        welcome_message = """
+WELCOME_MESSAGE: Final[str] = """
 🌟 Hello, Peruquois! I'm your personal assistant for project management.
 
 I'll help you:
@@ -59,31 +76,29 @@ Available commands:
 /help     – command reference  
 
 Ready to begin? Tell me about your ideas! ✨
-        """
-        await update.message.reply_text(welcome_message)
+""".strip()
 
-    async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """Handler for /help command"""
-        help_message = """
-🔮 **How I work**
+# Markdown (v1) formatted: *bold* section titles
+HELP_MESSAGE: Final[str] = """
+🔮 *How I work*
 
-📝 **Creating projects**  
+📝 *Creating projects*  
 Just tell me about your idea, for example:  
 • “I have an idea for a new song about motherhood”  
 • “I want to create a course on feminine energy”  
 • “I'm planning a retreat in the mountains”
 
-📊 **Updating status**  
+📊 *Updating status*  
 • “Started working on the moon song”  
 • “Pausing work on the course”  
 • “Finished recording the album”
 
-📋 **Viewing projects**  
+📋 *Viewing projects*  
 • “What am I working on?”  
 • “Show me all my songs”  
 • “What courses am I planning?”
 
-🎯 **Project types**  
+🎯 *Project types*  
 • Songs (Song)  
 • Books (Book)  
 • Courses (Course)  
@@ -92,100 +107,342 @@ Just tell me about your idea, for example:
 • Albums (Album)
 
 💫 Just write naturally—I’ll infer your intentions and organise everything myself!
-        """
-        await update.message.reply_text(help_message)
+""".strip()
+
+PROJECTS_HEADER: Final[str] = "🌟 *All your projects:*\n\n"
+ACTIVE_PROJECTS_HEADER: Final[str] = "🔥 *Your active projects:*\n\n"
+
+# Formatting mode for all Markdown replies
+MARKDOWN: Final[str] = ParseMode.MARKDOWN
+
+STATUS_EMOJI: Final[Mapping[str, str]] = MappingProxyType({
+    'Idea': '💡',
+    'In Progress': '🔥',
+    'Paused': '⏸️',
+    'Completed': '✅',
+    'Released': '🚀',
+    'Archived': '📦'
+})
+DEFAULT_STATUS_EMOJI: Final[str] = '📋'
+
+# Shared HTTP session timeouts: fail fast on connect, allow slow LLM generations
+HTTP_TIMEOUT: Final[aiohttp.ClientTimeout] = aiohttp.ClientTimeout(total=None, connect=5, sock_read=120)
+
+# Updates processed in parallel (one at a time per chat), so one slow Notion/OpenAI call does not stall other chats
+CONCURRENT_UPDATES: Final[int] = 64
+
+# URL path Telegram posts updates to in webhook mode (WEBHOOK_URL/<path>)
+WEBHOOK_PATH: Final[str] = "telegram"
+
+# Outbound Telegram calls per second, kept below the 30 msg/s per-bot limit
+TELEGRAM_MAX_RATE: Final[int] = 25
+# Times a call rejected with RetryAfter (429) is re-sent after waiting the requested delay
+TELEGRAM_MAX_RETRIES: Final[int] = 2
+
+# Paginated listings: projects per page and callback data prefixes ('<prefix>:<notion cursor>')
+PROJECTS_PAGE_SIZE: Final[int] = 20
+PROJECTS_PAGE_PREFIX: Final[str] = 'projects_page'
+ACTIVE_PAGE_PREFIX: Final[str] = 'active_page'
+
+# user_data key and lifetime (seconds) of a pending "which project?" choice
+PENDING_CLARIFY_KEY: Final[str] = 'pending_clarify'
+PENDING_CLARIFY_TTL: Final[float] = 300.0
+
+TYPE_EMOJI: Final[Mapping[str, str]] = MappingProxyType({
+    'Song': '🎵', 'Book': '📖', 'Course': '🎓',
+    'Retreat': '🏔️', 'Workshop': '🛠️', 'Album': '💿', 'Project': '📋'
+})
+DEFAULT_TYPE_EMOJI: Final[str] = '📋'
+
+# Minimum seconds between progressive edits of a streamed reply (Telegram edit rate limits)
+STREAM_EDIT_INTERVAL: Final[float] = 1.0
+
+# Clarify search: words too short or too common to tell projects apart
+CLARIFY_MIN_KEYWORD_LENGTH: Final[int] = 3
+CLARIFY_STOPWORDS: Final[frozenset] = frozenset({
+    'the', 'and', 'for', 'with', 'about', 'new', 'project', 'projects', 'idea', 'ideas',
+    'this', 'that', 'my', 'our', 'some', 'one', 'thing', 'work'
+})
+
+# Obvious requests answered without an LLM round-trip: (pattern, intent)
+_PROJECT_TYPES_PLURAL: Final[Mapping[str, str]] = MappingProxyType({
+    'songs': 'Song', 'books': 'Book', 'courses': 'Course',
+    'retreats': 'Retreat', 'workshops': 'Workshop', 'albums': 'Album'
+})
+FAST_INTENT_RULES: Final[tuple] = (
+    (re.compile(r"^(?:show|list)(?: me)?(?: all)?(?: of)?(?: my)? projects\W*$", re.IGNORECASE),
+     {'action': 'query_projects', 'query_type': 'all'}),
+    (re.compile(r"^(?:what am i working on|(?:show|list)(?: me)?(?: my)? (?:active|current) projects)\W*$", re.IGNORECASE),
+     {'action': 'query_projects', 'query_type': 'by_status', 'filters': {'status': 'In Progress'}}),
+    (re.compile(r"^(?:show|list)(?: me)?(?: all)?(?: of)?(?: my)? (songs|books|courses|retreats|workshops|albums)\W*$", re.IGNORECASE),
+     {'action': 'query_projects', 'query_type': 'by_type'}),
+)
 
-    async def projects_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """Handler for /projects command — show all projects"""
+
+def _match_fast_intent(text: str) -> Optional[Dict[str, Any]]:
+    """Classify trivially recognisable requests without calling OpenAI"""
+    stripped = text.strip()
+    for pattern, intent in FAST_INTENT_RULES:
+        match = pattern.match(stripped)
+        if match:
+            result = {**intent, 'message': text}
+            if match.groups():
+                result['filters'] = {'type': _PROJECT_TYPES_PLURAL[match.group(1).lower()]}
+            return normalize_intent(result)
+    return None
+
+
+@lru_cache(maxsize=256)
+def _escape(text: str) -> str:
+    """Escape user-provided text for Telegram Markdown"""
+    return escape_markdown(text, version=1)
+
+
+class PerChatUpdateProcessor(BaseUpdateProcessor):
+    """Process updates from different chats concurrently, but in arrival order within each chat"""
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        # Updates of each busy chat, oldest (the one running) first
+        self._chat_queues: Dict[int, Deque[Awaitable[Any]]] = {}
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if chat is None:
+            await coroutine
+            return
+
+        chat_id = chat.id
+        chat_queue = self._chat_queues.get(chat_id)
+        if chat_queue is not None:
+            # The chat's running update will process this one after its own, so no
+            # concurrency slot is held while waiting and other chats keep going
+            chat_queue.append(coroutine)
+            return
+
+        chat_queue = self._chat_queues[chat_id] = deque([coroutine])
         try:
-            projects = await self.notion.get_all_projects()
+            while chat_queue:
+                try:
+                    await chat_queue[0]
+                except Exception as e:
+                    logger.error("Error processing update for chat %s: %s", chat_id, e)
+                chat_queue.popleft()
+        finally:
+            # Forget the chat once nothing else is queued for it
+            del self._chat_queues[chat_id]
+            for pending in chat_queue:
+                if asyncio.iscoroutine(pending):
+                    pending.close()
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
 
-            if not projects:
-                await update.message.reply_text("You don’t have any saved projects yet. Share your ideas with me! ✨")
-                return
 
-            message = "🌟 **All your projects:**\n\n"
+class PeruquoisBot:
+    """Main Telegram bot class for Peruquois"""
+
+    __slots__ = ('config', 'notion', 'openai', 'http_session', '_warmup', '_action_dispatch')
+
+    def __init__(self):
+        self.config = Config.get_instance()
+        self.notion = NotionAPI(self.config)
+        self.openai = OpenAIAPI(self.config)
+
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self._warmup: Optional[asyncio.Task] = None
+
+        # action -> handler(intent_analysis, processing_msg, context, original_transcription)
+        self._action_dispatch = {
+            'create_project': self._handle_create_project,
+            'clarify_intent': self._handle_clarify_intent,
+            'update_status': self._handle_update_status,
+            'add_notes': self._handle_add_notes,
+            'update_project_info': self._handle_update_project_info,
+            'archive_project': self._handle_archive_project,
+            'update_project': self._handle_update_project,  # Backward compatibility
+            'query_projects': self._handle_query_projects,
+            'general_chat': self._handle_general_chat,
+        }
+
+    async def open(self) -> None:
+        """Open one pooled HTTP session shared by the Notion and OpenAI clients"""
+        if self.http_session is not None and not self.http_session.closed:
+            return
+        self.http_session = aiohttp.ClientSession(
+            # Keep idle TLS connections for a minute: user messages arrive in bursts with pauses between them;
+            # the API hosts are resolved once per five minutes instead of aiohttp's default ten seconds
+            connector=aiohttp.TCPConnector(
+                limit=20, limit_per_host=10, keepalive_timeout=60, ttl_dns_cache=300, enable_cleanup_closed=True
+            ),
+            timeout=HTTP_TIMEOUT
+        )
+        self.notion.session = self.http_session
+        self.openai.session = self.http_session
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session"""
+        if self._warmup is not None:
+            self._warmup.cancel()
+            self._warmup = None
+        if self.http_session is not None:
+            await self.http_session.close()
+
+    async def __aenter__(self) -> "PeruquoisBot":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def post_init(self, application: Application) -> None:
+        """Application startup hook"""
+        await self.open()
+        # Resolve Notion's host and open a TLS connection before the first message arrives;
+        # the schema read is cached, so the work is not wasted
+        self._warmup = asyncio.create_task(self.notion.get_database_schema())
+
+    async def post_shutdown(self, application: Application) -> None:
+        """Application shutdown hook"""
+        await self.aclose()
+
+    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handler for /start command"""
+        await update.message.reply_text(WELCOME_MESSAGE)
+
+    async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handler for /help command"""
+        await update.message.reply_text(HELP_MESSAGE, parse_mode=MARKDOWN)
 
-            # Group projects by type
-            projects_by_type: Dict[str, list] = {}
-            for project in projects:
-                project_type = project.get('type', 'Other')
-                projects_by_type.setdefault(project_type, []).append(project)
+    async def projects_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handler for /projects command — show all projects (first page)"""
+        try:
+            text, reply_markup = await self._render_projects_page(None)
 
-            # Build the message
-            for project_type, type_projects in projects_by_type.items():
-                message += f"**{project_type}:**\n"
-                for project in type_projects:
-                    name = project.get('name', 'Untitled')
-                    status = project.get('status', 'Unknown')
-                    status_emoji = self._get_status_emoji(status)
-                    message += f"  {status_emoji} {name} – {status}\n"
-                message += "\n"
+            if not text:
+                await update.message.reply_text("You don’t have any saved projects yet. Share your ideas with me! ✨")
+                return
 
-            await update.message.reply_text(message, parse_mode='Markdown')
+            await update.message.reply_text(text, parse_mode=MARKDOWN, reply_markup=reply_markup)
 
         except Exception as e:
-            logger.error(f"Error getting projects: {e}")
+            logger.error("Error getting projects: %s", e)
             await update.message.reply_text("An error occurred while retrieving the project list. Please try again later.")
 
     async def active_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """Handler for /active command — show active projects"""
+        """Handler for /active command — show active projects (first page)"""
         try:
-            projects = await self.notion.get_projects_by_status("In Progress")
+            text, reply_markup = await self._render_active_page(None)
 
-            if not projects:
+            if not text:
                 await update.message.reply_text("You have no active projects. Time to start something new! 🚀")
                 return
 
-            message = "🔥 **Your active projects:**\n\n"
-            for project in projects:
-                name = project.get('name', 'Untitled')
-                project_type = project.get('type', 'Project')
-                date = project.get('date', '')
-                tags = project.get('tags', [])
+            await update.message.reply_text(text, parse_mode=MARKDOWN, reply_markup=reply_markup)
+
+        except Exception as e:
+            logger.error("Error getting active projects: %s", e)
+            await update.message.reply_text("An error occurred while getting active projects. Please try again later.")
+
+    async def handle_page_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle "Next ▶" buttons of /projects and /active (callback data: '<kind>_page:<cursor>')"""
+        query = update.callback_query
+        try:
+            await query.answer()
 
-                message += f"🎯 **{name}** ({project_type})\n"
-                if date:
-                    message += f"   📅 {date}\n"
-                if tags:
-                    message += f"   🏷️ {', '.join(tags)}\n"
-                message += "\n"
+            kind, _, cursor = query.data.partition(':')
+            if kind == PROJECTS_PAGE_PREFIX:
+                text, reply_markup = await self._render_projects_page(cursor)
+            else:
+                text, reply_markup = await self._render_active_page(cursor)
+
+            if not text:
+                await query.edit_message_text("No more projects.")
+                return
 
-            await update.message.reply_text(message, parse_mode='Markdown')
+            await query.edit_message_text(text, parse_mode=MARKDOWN, reply_markup=reply_markup)
 
         except Exception as e:
-            logger.error(f"Error getting active projects: {e}")
-            await update.message.reply_text("An error occurred while getting active projects. Please try again later.")
+            logger.error("Error handling page callback: %s", e)
+            await query.edit_message_text("An error occurred while loading more projects.")
+
+    async def _render_projects_page(self, cursor: Optional[str]) -> tuple[Optional[str], Optional[InlineKeyboardMarkup]]:
+        """Render one page of /projects; returns (text or None if empty, keyboard)"""
+        projects_by_type, next_cursor = await self.notion.get_projects_grouped_by_type(
+            cursor, page_size=PROJECTS_PAGE_SIZE
+        )
+        if not projects_by_type:
+            return None, None
+
+        parts = [PROJECTS_HEADER]
+
+        # Build the message (already grouped by type in NotionAPI)
+        for project_type, type_projects in projects_by_type.items():
+            parts.append(f"*{_escape(project_type)}:*\n")
+            for project in type_projects:
+                status = project.get('status', 'Unknown')
+                status_emoji = STATUS_EMOJI.get(status, DEFAULT_STATUS_EMOJI)
+                parts.append(f"  {status_emoji} {_escape(project.get('name', 'Untitled'))} – {_escape(status)}\n")
+            parts.append("\n")
+
+        return "".join(parts), self._next_page_markup(PROJECTS_PAGE_PREFIX, next_cursor)
+
+    async def _render_active_page(self, cursor: Optional[str]) -> tuple[Optional[str], Optional[InlineKeyboardMarkup]]:
+        """Render one page of /active; returns (text or None if empty, keyboard)"""
+        projects, next_cursor = await self.notion.get_projects_page(
+            cursor, page_size=PROJECTS_PAGE_SIZE, status="In Progress"
+        )
+        if not projects:
+            return None, None
+
+        parts = [ACTIVE_PROJECTS_HEADER]
+        for project in projects:
+            name = project.get('name', 'Untitled')
+            project_type = project.get('type', 'Project')
+            date = project.get('date', '')
+            tags = project.get('tags', [])
+
+            parts.append(f"🎯 *{_escape(name)}* ({_escape(project_type)})\n")
+            if date:
+                parts.append(f"   📅 {_escape(date)}\n")
+            if tags:
+                parts.append(f"   🏷️ {', '.join(_escape(tag) for tag in tags)}\n")
+            parts.append("\n")
+
+        return "".join(parts), self._next_page_markup(ACTIVE_PAGE_PREFIX, next_cursor)
+
+    @staticmethod
+    def _next_page_markup(prefix: str, next_cursor: Optional[str]) -> Optional[InlineKeyboardMarkup]:
+        """Keyboard with a "Next ▶" button carrying the Notion cursor, if there is a next page"""
+        if not next_cursor:
+            return None
+        return InlineKeyboardMarkup([[InlineKeyboardButton("Next ▶", callback_data=f"{prefix}:{next_cursor}")]])
 
     async def handle_voice_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handler for voice messages"""
         try:
             processing_msg = await update.message.reply_text("🎤 Listening to your message…")
 
-            # Retrieve voice file
+            # Retrieve voice file into memory (no temporary file on disk)
             voice_file = await update.message.voice.get_file()
-
-            # Save locally
-            voice_path = f"/tmp/voice_{update.message.message_id}.ogg"
-            await voice_file.download_to_drive(voice_path)
+            voice_data = await voice_file.download_as_bytearray()
 
             # Transcribe the voice message
-            transcription = await self.openai.transcribe_audio(voice_path)
-
-            # Remove temporary file
-            os.remove(voice_path)
+            transcription = await self.openai.transcribe_audio(voice_data, filename="voice.ogg")
 
             if not transcription:
                 await processing_msg.edit_text("Could not recognise the voice message. Please try again.")
                 return
 
-            # Process the transcribed text
-            await processing_msg.edit_text(f"📝 I heard: “{transcription}”\n\nProcessing…")
+            # Process the transcribed text (the next edit of processing_msg is the result)
             await self._process_text_message(update, context, transcription, processing_msg,
                                              original_transcription=transcription)
 
         except Exception as e:
-            logger.error(f"Error processing voice message: {e}")
+            logger.error("Error processing voice message: %s", e)
             await update.message.reply_text("An error occurred while processing the voice message. Please try typing instead.")
 
     async def handle_text_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -197,7 +454,7 @@ Just tell me about your idea, for example:
             await self._process_text_message(update, context, text, processing_msg)
 
         except Exception as e:
-            logger.error(f"Error processing text message: {e}")
+            logger.error("Error processing text message: %s", e)
             await update.message.reply_text("An error occurred while processing the message. Please try again.")
 
     async def _process_text_message(
@@ -210,39 +467,23 @@ Just tell me about your idea, for example:
     ) -> None:
         """Internal method for processing text messages"""
         try:
-            # Analyze intent with enhanced column optimization
-            intent_analysis = await self.openai.enhanced_intent_analysis(text)
+            # Analyze intent: rule-based fast path first, then OpenAI with column optimization
+            intent_analysis = _match_fast_intent(text) or await self.openai.enhanced_intent_analysis(text)
             if not intent_analysis:
                 await processing_msg.edit_text("I couldn’t understand that. Could you rephrase?")
                 return
 
-            action = intent_analysis.get('action')
-
-            if action == 'create_project':
-                await self._handle_create_project(intent_analysis, processing_msg, original_transcription)
-            elif action == 'clarify_intent':
-                await self._handle_clarify_intent(intent_analysis, processing_msg, original_transcription)
-            elif action == 'update_status':
-                await self._handle_update_status(intent_analysis, processing_msg)
-            elif action == 'add_notes':
-                await self._handle_add_notes(intent_analysis, processing_msg, original_transcription)
-            elif action == 'update_project_info':
-                await self._handle_update_project_info(intent_analysis, processing_msg)
-            elif action == 'archive_project':
-                await self._handle_archive_project(intent_analysis, processing_msg)
-            elif action == 'update_project':            # Backward compatibility
-                await self._handle_update_project(intent_analysis, processing_msg)
-            elif action == 'query_projects':
-                await self._handle_query_projects(intent_analysis, processing_msg)
-            elif action == 'general_chat':
-                await self._handle_general_chat(intent_analysis, processing_msg)
-            else:
+            handler = self._action_dispatch.get(intent_analysis['action'])
+            if handler is None:
                 await processing_msg.edit_text(
                     "I understand the message, but I’m not sure how to respond. Could you be more specific?"
                 )
+                return
+
+            await handler(intent_analysis, processing_msg, context, original_transcription)
 
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
             await processing_msg.edit_text("An error occurred during processing. Please try again.")
 
     # ---------- Handlers for specific actions ----------
@@ -251,11 +492,12 @@ Just tell me about your idea, for example:
         self,
         intent_analysis: Dict[str, Any],
         processing_msg: Message,
+        context: ContextTypes.DEFAULT_TYPE,
         original_transcription: str | None = None
     ) -> None:
         """Handle creating a new project"""
         try:
-            project_data = intent_analysis.get('project_data', {})
+            project_data = intent_analysis['project_data']
 
             # Attach original transcription to Original Audio field
             if original_transcription:
@@ -264,63 +506,86 @@ Just tell me about your idea, for example:
             # Keep processed notes in the notes field
             # (notes field will be saved to "Processed Notes" column)
 
-            # Create project in Notion
-            created_project = await self.notion.create_project(project_data)
-
-            if created_project:
-                name = project_data.get('name', 'New Project')
-                project_type = project_data.get('type', 'Project')
+            name = project_data.get('name', 'New Project')
+            project_type = project_data.get('type', 'Project')
 
-                response = await self.openai.generate_response(
-                    f"Project '{name}' of type '{project_type}' created successfully",
-                    "create_success"
+            # The intent analysis usually carries the confirmation text; otherwise generate it while creating
+            response = intent_analysis['reply']
+            if response:
+                created_project = await self.notion.create_project(project_data)
+            else:
+                created_project, response = await asyncio.gather(
+                    self.notion.create_project(project_data),
+                    self.openai.generate_response(
+                        f"Project '{name}' of type '{project_type}' created successfully",
+                        "create_success"
+                    )
                 )
+
+            if created_project:
                 await processing_msg.edit_text(f"✨ {response}")
             else:
                 await processing_msg.edit_text("Could not create the project. Please try again.")
 
         except Exception as e:
-            logger.error(f"Error creating project: {e}")
+            logger.error("Error creating project: %s", e)
             await processing_msg.edit_text("An error occurred while creating the project.")
 
-    async def _handle_update_project(self, intent_analysis: Dict[str, Any], processing_msg: Message) -> None:
+    async def _handle_update_project(
+        self,
+        intent_analysis: Dict[str, Any],
+        processing_msg: Message,
+        context: ContextTypes.DEFAULT_TYPE,
+        original_transcription: str | None = None
+    ) -> None:
         """Handle updating an existing project (legacy path)"""
         try:
-            project_name = intent_analysis.get('project_name')
-            new_status = intent_analysis.get('new_status')
+            project_name = intent_analysis['project_name']
+            new_status = intent_analysis['new_status']
 
             if not project_name or not new_status:
                 await processing_msg.edit_text("Which project should be updated? Please clarify.")
                 return
 
-            updated = await self.notion.update_project_status(project_name, new_status)
-
-            if updated:
-                response = await self.openai.generate_response(
+            updated, response = await asyncio.gather(
+                self.notion.find_and_update_project_status(project_name, new_status),
+                self.openai.generate_response(
                     f"Project '{project_name}' status changed to '{new_status}'",
                     "update_success"
                 )
+            )
+
+            if updated:
                 await processing_msg.edit_text(f"🔄 {response}")
             else:
                 await processing_msg.edit_text(f"Could not find project '{project_name}' or update its status.")
 
         except Exception as e:
-            logger.error(f"Error updating project: {e}")
+            logger.error("Error updating project: %s", e)
             await processing_msg.edit_text("An error occurred while updating the project.")
 
-    async def _handle_query_projects(self, intent_analysis: Dict[str, Any], processing_msg: Message) -> None:
+    async def _handle_query_projects(
+        self,
+        intent_analysis: Dict[str, Any],
+        processing_msg: Message,
+        context: ContextTypes.DEFAULT_TYPE,
+        original_transcription: str | None = None
+    ) -> None:
         """Handle project information queries"""
         try:
-            query_type = intent_analysis.get('query_type')
-            filters = intent_analysis.get('filters', {})
+            query_type = intent_analysis['query_type']
+            filters = intent_analysis['filters']
 
             projects: list[Dict[str, Any]] = []
+            status = filters.get('status')
+            project_type = filters.get('type')
 
-            if query_type == 'by_status':
-                status = filters.get('status')
+            if status and project_type:
+                # e.g. "which songs are in progress?": filter on both server-side in one query
+                projects = await self.notion.get_projects_matching(status, project_type)
+            elif query_type == 'by_status':
                 projects = await self.notion.get_projects_by_status(status)
             elif query_type == 'by_type':
-                project_type = filters.get('type')
                 projects = await self.notion.get_projects_by_type(project_type)
             else:
                 projects = await self.notion.get_all_projects()
@@ -330,75 +595,80 @@ Just tell me about your idea, for example:
                 return
 
             response = await self.openai.format_projects_response(projects, query_type)
-            await processing_msg.edit_text(response, parse_mode='Markdown')
+            await processing_msg.edit_text(response, parse_mode=MARKDOWN)
 
         except Exception as e:
-            logger.error(f"Error querying projects: {e}")
+            logger.error("Error querying projects: %s", e)
             await processing_msg.edit_text("An error occurred while searching for projects.")
 
-    async def _handle_general_chat(self, intent_analysis: Dict[str, Any], processing_msg: Message) -> None:
+    async def _handle_general_chat(
+        self,
+        intent_analysis: Dict[str, Any],
+        processing_msg: Message,
+        context: ContextTypes.DEFAULT_TYPE,
+        original_transcription: str | None = None
+    ) -> None:
         """Handle general (non-actionable) messages"""
         try:
-            original_message = intent_analysis.get('message', '')
-            response = await self.openai.generate_response(original_message, "general_chat")
-            await processing_msg.edit_text(response)
+            original_message = intent_analysis['message']
+            await self._stream_reply(
+                processing_msg,
+                self.openai.stream_response(original_message, "general_chat")
+            )
 
         except Exception as e:
-            logger.error(f"Error handling general chat: {e}")
+            logger.error("Error handling general chat: %s", e)
             await processing_msg.edit_text("An error occurred while processing the message.")
 
-    async def _handle_update_status(self, intent_analysis: Dict[str, Any], processing_msg: Message) -> None:
+    async def _handle_update_status(
+        self,
+        intent_analysis: Dict[str, Any],
+        processing_msg: Message,
+        context: ContextTypes.DEFAULT_TYPE,
+        original_transcription: str | None = None
+    ) -> None:
         """Handle project status updates"""
         try:
-            project_identifier = intent_analysis.get('project_identifier', '')
-            new_status = intent_analysis.get('new_status', '')
-            reason = intent_analysis.get('reason', '')
+            project_identifier = intent_analysis['project_identifier']
+            new_status = intent_analysis['new_status']
+            reason = intent_analysis['reason']
 
             if not project_identifier or not new_status:
                 await processing_msg.edit_text("Project or new status not specified.")
                 return
 
-            project = await self.notion.find_project_by_keywords(project_identifier)
-            if not project:
-                await processing_msg.edit_text(f"Project '{project_identifier}' not found.")
-                return
-
-            success = await self.notion.update_project_status(project['name'], new_status)
+            project = await self.notion.find_and_update_project_status(project_identifier, new_status)
 
-            if success:
+            if project:
                 emoji = self._get_status_emoji(new_status)
                 response = f"{emoji} Project '{project['name']}' status changed to '{new_status}'"
                 if reason:
                     response += f"\nReason: {reason}"
                 await processing_msg.edit_text(response)
             else:
-                await processing_msg.edit_text(f"Could not update project '{project['name']}'.")
+                await processing_msg.edit_text(f"Could not find or update project '{project_identifier}'.")
 
         except Exception as e:
-            logger.error(f"Error updating status: {e}")
+            logger.error("Error updating status: %s", e)
             await processing_msg.edit_text("An error occurred while updating the status.")
 
     async def _handle_add_notes(
         self,
         intent_analysis: Dict[str, Any],
         processing_msg: Message,
+        context: ContextTypes.DEFAULT_TYPE,
         original_transcription: str | None = None
     ) -> None:
         """Handle adding notes to a project"""
         try:
-            project_identifier = intent_analysis.get('project_identifier', '')
-            additional_notes = intent_analysis.get('additional_notes', '')
-            note_type = intent_analysis.get('note_type', 'update')
+            project_identifier = intent_analysis['project_identifier']
+            additional_notes = intent_analysis['additional_notes']
+            note_type = intent_analysis['note_type']
 
             if not project_identifier or not additional_notes:
                 await processing_msg.edit_text("Project or notes not specified.")
                 return
 
-            project = await self.notion.find_project_by_keywords(project_identifier)
-            if not project:
-                await processing_msg.edit_text(f"Project '{project_identifier}' not found.")
-                return
-
             # Add original transcription to Original Audio if available
             update_data = {}
             if original_transcription:
@@ -409,35 +679,36 @@ Just tell me about your idea, for example:
                 update_data['additional_notes'] = additional_notes
                 update_data['note_type'] = note_type
 
-            success = await self.notion.add_notes_to_project(project_identifier, update_data)
+            project = await self.notion.add_notes_to_project(project_identifier, update_data)
 
-            if success:
+            if project:
                 await processing_msg.edit_text(f"📝 Notes added to project '{project['name']}'")
             else:
-                await processing_msg.edit_text(f"Could not add notes to project '{project['name']}'.")
+                await processing_msg.edit_text(f"Could not find project '{project_identifier}' or add notes to it.")
 
         except Exception as e:
-            logger.error(f"Error adding notes: {e}")
+            logger.error("Error adding notes: %s", e)
             await processing_msg.edit_text("An error occurred while adding notes.")
 
-    async def _handle_update_project_info(self, intent_analysis: Dict[str, Any], processing_msg: Message) -> None:
+    async def _handle_update_project_info(
+        self,
+        intent_analysis: Dict[str, Any],
+        processing_msg: Message,
+        context: ContextTypes.DEFAULT_TYPE,
+        original_transcription: str | None = None
+    ) -> None:
         """Handle updating project metadata"""
         try:
-            project_identifier = intent_analysis.get('project_identifier', '')
-            updates = intent_analysis.get('updates', {})
+            project_identifier = intent_analysis['project_identifier']
+            updates = intent_analysis['updates']
 
             if not project_identifier or not updates:
                 await processing_msg.edit_text("Project or changes not specified.")
                 return
 
-            project = await self.notion.find_project_by_keywords(project_identifier)
-            if not project:
-                await processing_msg.edit_text(f"Project '{project_identifier}' not found.")
-                return
-
-            success = await self.notion.update_project_info(project_identifier, updates)
+            project = await self.notion.update_project_info(project_identifier, updates)
 
-            if success:
+            if project:
                 changes: list[str] = []
                 if 'name' in updates:
                     changes.append(f"name → '{updates['name']}'")
@@ -446,86 +717,96 @@ Just tell me about your idea, for example:
                 if 'tags' in updates:
                     changes.append(f"tags → {updates['tags']}")
 
-                response = f"✏️ Project '{project['name']}' updated:\n"
-                response += "\n".join(f"• {ch}" for ch in changes)
-                await processing_msg.edit_text(response)
+                lines = [f"✏️ Project '{project['name']}' updated:"]
+                lines.extend(f"• {ch}" for ch in changes)
+                await processing_msg.edit_text("\n".join(lines))
             else:
-                await processing_msg.edit_text(f"Could not update project '{project['name']}'.")
+                await processing_msg.edit_text(f"Could not find or update project '{project_identifier}'.")
 
         except Exception as e:
-            logger.error(f"Error updating project info: {e}")
+            logger.error("Error updating project info: %s", e)
             await processing_msg.edit_text("An error occurred while updating project information.")
 
-    async def _handle_archive_project(self, intent_analysis: Dict[str, Any], processing_msg: Message) -> None:
+    async def _handle_archive_project(
+        self,
+        intent_analysis: Dict[str, Any],
+        processing_msg: Message,
+        context: ContextTypes.DEFAULT_TYPE,
+        original_transcription: str | None = None
+    ) -> None:
         """Handle archiving a project"""
         try:
-            project_identifier = intent_analysis.get('project_identifier', '')
-            reason = intent_analysis.get('reason', '')
+            project_identifier = intent_analysis['project_identifier']
+            reason = intent_analysis['reason']
 
             if not project_identifier:
                 await processing_msg.edit_text("Project to archive not specified.")
                 return
 
-            project = await self.notion.find_project_by_keywords(project_identifier)
-            if not project:
-                await processing_msg.edit_text(f"Project '{project_identifier}' not found.")
-                return
-
-            success = await self.notion.archive_project(project_identifier, reason)
+            project = await self.notion.archive_project(project_identifier, reason)
 
-            if success:
+            if project:
                 response = f"📦 Project '{project['name']}' archived"
                 if reason:
                     response += f"\nReason: {reason}"
                 await processing_msg.edit_text(response)
             else:
-                await processing_msg.edit_text(f"Could not archive project '{project['name']}'.")
+                await processing_msg.edit_text(f"Could not find or archive project '{project_identifier}'.")
 
         except Exception as e:
-            logger.error(f"Error archiving project: {e}")
+            logger.error("Error archiving project: %s", e)
             await processing_msg.edit_text("An error occurred while archiving the project.")
 
     async def _handle_clarify_intent(
         self,
         intent_analysis: Dict[str, Any],
         processing_msg: Message,
+        context: ContextTypes.DEFAULT_TYPE,
         original_transcription: str | None = None
     ) -> None:
         """Handle intent clarification by showing similar projects"""
         try:
-            search_keywords = intent_analysis.get('search_keywords', '')
-            project_data = intent_analysis.get('project_data', {})
+            keywords = [
+                word for word in intent_analysis['search_keywords'].lower().split()
+                if len(word) >= CLARIFY_MIN_KEYWORD_LENGTH and word not in CLARIFY_STOPWORDS
+            ]
             
-            if not search_keywords:
-                # Fallback to creating new project if no keywords
-                await self._handle_create_project(intent_analysis, processing_msg, original_transcription)
+            if not keywords:
+                # Fallback to creating new project if there is nothing meaningful to search for
+                await self._handle_create_project(intent_analysis, processing_msg, context, original_transcription)
                 return
             
             # Search for similar projects
-            similar_projects = await self.notion.find_similar_projects(search_keywords, limit=5)
+            similar_projects = await self.notion.find_similar_projects(" ".join(keywords), limit=5)
             
             if not similar_projects:
                 # No similar projects found, create new one
-                await self._handle_create_project(intent_analysis, processing_msg, original_transcription)
+                await self._handle_create_project(intent_analysis, processing_msg, context, original_transcription)
                 return
             
             # Store context for callback handling
             context_data = {
                 'intent_analysis': intent_analysis,
                 'original_transcription': original_transcription,
-                'similar_projects': similar_projects
+                # Page ids only: the chosen page is re-read before it is written
+                'project_ids': [project['id'] for project in similar_projects[:5]],
+                'created_at': time.monotonic()
             }
             
-            # Create inline keyboard with options
+            # Build the message and the inline keyboard in one pass (max 5 similar projects)
+            parts = ["🤔 I hear you want to make changes. I found some similar projects:\n\n"]
             keyboard = []
             
-            # Add buttons for similar projects (max 5)
             for i, project in enumerate(similar_projects[:5]):
-                project_name = project.get('name', 'Untitled')
+                name = project.get('name', 'Untitled')
                 project_type = project.get('type', 'Project')
-                button_text = f"{i+1}. {project_name} ({project_type})"
-                callback_data = f"select_project_{i}"
-                keyboard.append([InlineKeyboardButton(button_text, callback_data=callback_data)])
+                status = project.get('status', 'Unknown')
+                
+                emoji = TYPE_EMOJI.get(project_type, DEFAULT_TYPE_EMOJI)
+                
+                parts.append(f"{i+1}️⃣ {emoji} *{_escape(name)}*\n")
+                parts.append(f"    Type: {_escape(project_type)} | Status: {_escape(status)}\n\n")
+                keyboard.append([InlineKeyboardButton(f"{i+1}. {name} ({project_type})", callback_data=f"select_project_{i}")])
             
             # Add "Create New Project" and "Cancel" options
             keyboard.append([InlineKeyboardButton("🆕 Create New Project", callback_data="create_new")])
@@ -533,38 +814,16 @@ Just tell me about your idea, for example:
             
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            # Store context in user_data for callback handling
-            user_id = processing_msg.chat.id
-            if not hasattr(processing_msg, 'bot'):
-                # This is a workaround - we'll store in a class variable
-                if not hasattr(self, '_pending_contexts'):
-                    self._pending_contexts = {}
-                self._pending_contexts[user_id] = context_data
+            # Store context in user_data for callback handling (replaces any older pending choice)
+            self._evict_expired_clarify(context)
+            context.user_data[PENDING_CLARIFY_KEY] = context_data
             
-            # Format message with similar projects
-            message_text = "🤔 I hear you want to make changes. I found some similar projects:\n\n"
+            parts.append("Choose an option below:")
             
-            for i, project in enumerate(similar_projects[:5]):
-                name = project.get('name', 'Untitled')
-                project_type = project.get('type', 'Project')
-                status = project.get('status', 'Unknown')
-                
-                # Add emoji for project type
-                type_emojis = {
-                    'Song': '🎵', 'Book': '📖', 'Course': '🎓',
-                    'Retreat': '🏔️', 'Workshop': '🛠️', 'Album': '💿', 'Project': '📋'
-                }
-                emoji = type_emojis.get(project_type, '📋')
-                
-                message_text += f"{i+1}️⃣ {emoji} **{name}**\n"
-                message_text += f"    Type: {project_type} | Status: {status}\n\n"
-            
-            message_text += "Choose an option below:"
-            
-            await processing_msg.edit_text(message_text, reply_markup=reply_markup, parse_mode='Markdown')
+            await processing_msg.edit_text("".join(parts), reply_markup=reply_markup, parse_mode=MARKDOWN)
             
         except Exception as e:
-            logger.error(f"Error handling clarify intent: {e}")
+            logger.error("Error handling clarify intent: %s", e)
             await processing_msg.edit_text("An error occurred while searching for similar projects.")
 
     async def handle_callback_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -573,42 +832,39 @@ Just tell me about your idea, for example:
             query = update.callback_query
             await query.answer()  # Acknowledge the callback query
             
-            user_id = query.message.chat.id
             callback_data = query.data
             
-            # Retrieve stored context
-            if not hasattr(self, '_pending_contexts') or user_id not in self._pending_contexts:
+            # Retrieve stored context (consumed once a choice is accepted; dropped once older than the TTL)
+            context_data = context.user_data.get(PENDING_CLARIFY_KEY)
+            if not context_data or time.monotonic() - context_data['created_at'] > PENDING_CLARIFY_TTL:
+                context.user_data.pop(PENDING_CLARIFY_KEY, None)
                 await query.edit_message_text("Session expired. Please try again.")
                 return
             
-            context_data = self._pending_contexts[user_id]
             intent_analysis = context_data['intent_analysis']
             original_transcription = context_data['original_transcription']
-            similar_projects = context_data['similar_projects']
+            project_ids = context_data['project_ids']
             
             if callback_data == "cancel":
+                del context.user_data[PENDING_CLARIFY_KEY]
                 await query.edit_message_text("Operation cancelled.")
-                del self._pending_contexts[user_id]
                 return
             
             elif callback_data == "create_new":
                 # Create new project
+                del context.user_data[PENDING_CLARIFY_KEY]
                 await query.edit_message_text("Creating new project...")
-                await self._handle_create_project(intent_analysis, query.message, original_transcription)
-                del self._pending_contexts[user_id]
+                await self._handle_create_project(intent_analysis, query.message, context, original_transcription)
                 return
             
             elif callback_data.startswith("select_project_"):
                 # Add to existing project
                 project_index = int(callback_data.split("_")[-1])
-                if project_index < len(similar_projects):
-                    selected_project = similar_projects[project_index]
-                    project_name = selected_project.get('name', 'Untitled')
-                    
-                    await query.edit_message_text(f"Adding notes to '{project_name}'...")
+                if project_index < len(project_ids):
+                    del context.user_data[PENDING_CLARIFY_KEY]
                     
                     # Prepare data for adding notes
-                    project_data = intent_analysis.get('project_data', {})
+                    project_data = intent_analysis['project_data']
                     additional_notes = project_data.get('notes', '')
                     
                     # Create update data
@@ -625,43 +881,77 @@ Just tell me about your idea, for example:
                         update_data['additional_notes'] = "Audio transcription added to project"
                         update_data['note_type'] = 'update'
                     
-                    # Add notes to the selected project
-                    success = await self.notion.add_notes_to_project(project_name, update_data)
+                    # One page read and a single PATCH: fast enough to report only the outcome
+                    project = await self.notion.add_notes_to_page(project_ids[project_index], update_data)
                     
-                    if success:
-                        await query.edit_message_text(f"✅ Notes added to '{project_name}' successfully!")
+                    if project:
+                        await query.edit_message_text(f"✅ Notes added to '{project['name']}' successfully!")
                     else:
-                        await query.edit_message_text(f"❌ Failed to add notes to '{project_name}'.")
-                    
-                    del self._pending_contexts[user_id]
+                        await query.edit_message_text("❌ Failed to add notes to the selected project.")
                 else:
                     await query.edit_message_text("Invalid selection. Please try again.")
             
         except Exception as e:
-            logger.error(f"Error handling callback query: {e}")
+            logger.error("Error handling callback query: %s", e)
             await query.edit_message_text("An error occurred while processing your selection.")
 
     # ---------- Utility ----------
 
+    @staticmethod
+    def _evict_expired_clarify(context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Drop pending clarify choices, from any user, that were abandoned past their TTL"""
+        now = time.monotonic()
+        for user_data in context.application.user_data.values():
+            pending = user_data.get(PENDING_CLARIFY_KEY)
+            if pending and now - pending['created_at'] > PENDING_CLARIFY_TTL:
+                del user_data[PENDING_CLARIFY_KEY]
+
+    async def _stream_reply(self, processing_msg: Message, chunks: AsyncIterator[str]) -> None:
+        """Show a streamed reply by editing the message at most once per STREAM_EDIT_INTERVAL"""
+        loop = asyncio.get_running_loop()
+        parts: list[str] = []
+        shown = ""
+        last_edit = loop.time()
+
+        async for chunk in chunks:
+            parts.append(chunk)
+            now = loop.time()
+            if now - last_edit >= STREAM_EDIT_INTERVAL:
+                partial = "".join(parts).strip()
+                # Whitespace-only chunks leave the visible text unchanged: skip the no-op edit
+                if partial != shown:
+                    await processing_msg.edit_text(f"{partial} …")
+                    shown = partial
+                    last_edit = now
+
+        text = "".join(parts).strip() or RESPONSE_FALLBACK
+        await processing_msg.edit_text(text)
+
     @staticmethod
     def _get_status_emoji(status: str) -> str:
         """Return an emoji for the given project status"""
-        return {
-            'Idea': '💡',
-            'In Progress': '🔥',
-            'Paused': '⏸️',
-            'Completed': '✅',
-            'Released': '🚀',
-            'Archived': '📦'
-        }.get(status, '📋')
+        return STATUS_EMOJI.get(status, DEFAULT_STATUS_EMOJI)
 
 # ---------- Entry point ----------
 
 def main() -> None:
     """Start the bot"""
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     bot = PeruquoisBot()
 
-    application = Application.builder().token(bot.config.TELEGRAM_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(bot.config.TELEGRAM_TOKEN)
+        .post_init(bot.post_init)
+        .post_shutdown(bot.post_shutdown)
+        .concurrent_updates(PerChatUpdateProcessor(CONCURRENT_UPDATES))
+        .rate_limiter(AIORateLimiter(
+            overall_max_rate=TELEGRAM_MAX_RATE, overall_time_period=1, max_retries=TELEGRAM_MAX_RETRIES
+        ))
+        .build()
+    )
 
     # Command handlers
     application.add_handler(CommandHandler("start", bot.start_command))
@@ -673,11 +963,27 @@ def main() -> None:
     application.add_handler(MessageHandler(filters.VOICE, bot.handle_voice_message))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, bot.handle_text_message))
     
-    # Callback query handler for inline buttons
+    # Callback query handlers for inline buttons (pagination first, clarify choices catch the rest)
+    application.add_handler(CallbackQueryHandler(
+        bot.handle_page_callback, pattern=f"^({PROJECTS_PAGE_PREFIX}|{ACTIVE_PAGE_PREFIX}):"
+    ))
     application.add_handler(CallbackQueryHandler(bot.handle_callback_query))
 
-    logger.info("Starting Peruquois bot…")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    config = bot.config
+    if config.WEBHOOK_URL:
+        # Telegram pushes updates to us: no getUpdates long-poll round-trips
+        logger.info("Starting Peruquois bot (webhook on port %s)…", config.WEBHOOK_PORT)
+        application.run_webhook(
+            listen="0.0.0.0",
+            port=config.WEBHOOK_PORT,
+            url_path=WEBHOOK_PATH,
+            webhook_url=f"{config.WEBHOOK_URL}/{WEBHOOK_PATH}",
+            secret_token=config.WEBHOOK_SECRET,
+            allowed_updates=Update.ALL_TYPES
+        )
+    else:
+        logger.info("Starting Peruquois bot (long polling)…")
+        application.run_polling(allowed_updates=Update.ALL_TYPES)
 
 if __name__ == '__main__':
     main()
@@ -5,48 +5,329 @@ Handles all operations with Peruquois’ project database
 
 import asyncio
 import aiohttp
+import functools
 import logging
+import orjson
+import random
+import re
+import sys
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from telegram.helpers import escape_markdown
 
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Emoji shown next to each project type in text listings
+TYPE_EMOJIS: Mapping[str, str] = MappingProxyType({
+    'Song': '🎵',
+    'Book': '📖',
+    'Course': '🎓',
+    'Retreat': '🏔️',
+    'Workshop': '🛠️',
+    'Album': '💿',
+    'Project': '📋'
+})
+
+# Emoji for each project status, used by _get_status_emoji
+STATUS_EMOJIS: Mapping[str, str] = MappingProxyType({
+    "Idea": "💡",
+    "Planning": "📋",
+    "In Progress": "🔄",
+    "On Hold": "⏸️",
+    "Completed": "✅",
+    "Archived": "📦"
+})
+
+
+# Option lists offered by the optimal columns (see NotionAPI._determine_optimal_columns)
+KEY_SIGNATURE_OPTIONS = ("C Major", "G Major", "D Major", "A Major", "E Major", "B Major", "F# Major", "C# Major", "F Major", "Bb Major", "Eb Major", "Ab Major", "Db Major", "Gb Major", "Cb Major")
+INSTRUMENTS_OPTIONS = ("Piano", "Guitar", "Vocals", "Drums", "Bass", "Strings", "Synth", "Flute", "Violin")
+MOOD_OPTIONS = ("Peaceful", "Energetic", "Melancholic", "Joyful", "Mysterious", "Romantic", "Powerful", "Dreamy")
+MATERIALS_NEEDED_OPTIONS = ("Mats", "Music", "Props", "Handouts", "Projector", "Microphone", "Candles", "Crystals")
+ENERGY_LEVEL_OPTIONS = ("Gentle", "Moderate", "High Energy", "Mixed", "Restorative")
+FOCUS_AREA_OPTIONS = ("Movement", "Breathing", "Meditation", "Expression", "Healing", "Connection", "Creativity")
+ACCOMMODATION_OPTIONS = ("Included", "Not Included", "Optional", "Camping", "Hotel", "Shared Rooms")
+MEALS_OPTIONS = ("All Included", "Breakfast Only", "Not Included", "Vegetarian", "Vegan", "Raw Food")
+DANCE_STYLE_OPTIONS = ("Feminine Movement", "Ecstatic Dance", "Contact Improv", "Contemporary", "Tribal", "Belly Dance", "Sacred Dance")
+MUSIC_STYLE_OPTIONS = ("Ambient", "World Music", "Electronic", "Acoustic", "Tribal", "Classical", "Nature Sounds")
+PROPS_NEEDED_OPTIONS = ("Scarves", "Fans", "Ribbons", "Mirrors", "Candles", "Crystals", "Flowers", "Feathers")
+BREATHING_TECHNIQUE_OPTIONS = ("Deep Breathing", "Pranayama", "Circular Breathing", "Box Breathing", "Wim Hof", "Holotropic")
+ENERGY_FOCUS_OPTIONS = ("Root Chakra", "Sacral Chakra", "Solar Plexus", "Heart Chakra", "Throat Chakra", "Third Eye", "Crown Chakra", "Aura Cleansing")
+MOON_PHASE_OPTIONS = ("New Moon", "Waxing Crescent", "First Quarter", "Waxing Gibbous", "Full Moon", "Waning Gibbous", "Last Quarter", "Waning Crescent")
+CRYSTALS_USED_OPTIONS = ("Amethyst", "Rose Quartz", "Clear Quartz", "Citrine", "Black Tourmaline", "Selenite", "Labradorite", "Moonstone")
+COLLABORATORS_OPTIONS = ("Musicians", "Dancers", "Healers", "Artists", "Teachers", "Photographers", "Videographers")
+PUBLISHING_PLATFORM_OPTIONS = ("Instagram", "YouTube", "Website", "Spotify", "SoundCloud", "Facebook", "TikTok", "Newsletter")
+PRIORITY_LEVEL_OPTIONS = ("Low", "Medium", "High", "Urgent")
+RESOURCES_NEEDED_OPTIONS = ("Time", "Money", "Equipment", "Space", "People", "Research", "Practice", "Inspiration")
+
+# Optimal column rules, applied in order: (group, triggers, columns). A rule applies when any
+# (field, word) trigger has word as a substring of that request field, or always when it has no
+# triggers; within a group only the first matching rule applies.
+OPTIMAL_COLUMN_RULES: Tuple[Tuple[Optional[str], Tuple[Tuple[str, str], ...], Mapping[str, Mapping[str, Any]]], ...] = tuple(
+    (group, triggers, MappingProxyType({name: MappingProxyType(spec) for name, spec in columns.items()}))
+    for group, triggers, columns in (
+        # Always useful columns for detailed tracking
+        (None, (), {
+            "Original Transcription": {"type": "rich_text"},
+            "Processed Notes": {"type": "rich_text"},
+        }),
+        # Project type specific columns
+        ("kind", (("project_type", "song"), ("content", "music")), {
+            "Key Signature": {"type": "select", "options": KEY_SIGNATURE_OPTIONS},
+            "Tempo": {"type": "number"},
+            "Duration": {"type": "rich_text"},
+            "Instruments": {"type": "multi_select", "options": INSTRUMENTS_OPTIONS},
+            "Mood": {"type": "select", "options": MOOD_OPTIONS},
+        }),
+        ("kind", (("project_type", "workshop"), ("project_type", "course"), ("content", "class")), {
+            "Duration": {"type": "rich_text"},
+            "Participants": {"type": "number"},
+            "Location": {"type": "rich_text"},
+            "Materials Needed": {"type": "multi_select", "options": MATERIALS_NEEDED_OPTIONS},
+            "Energy Level": {"type": "select", "options": ENERGY_LEVEL_OPTIONS},
+            "Focus Area": {"type": "select", "options": FOCUS_AREA_OPTIONS},
+        }),
+        ("kind", (("project_type", "retreat"), ("content", "event")), {
+            "Start Date": {"type": "date"},
+            "End Date": {"type": "date"},
+            "Location": {"type": "rich_text"},
+            "Capacity": {"type": "number"},
+            "Price": {"type": "number"},
+            "Accommodation": {"type": "select", "options": ACCOMMODATION_OPTIONS},
+            "Meals": {"type": "select", "options": MEALS_OPTIONS},
+        }),
+        ("kind", (("content", "dance"), ("content", "movement")), {
+            "Dance Style": {"type": "multi_select", "options": DANCE_STYLE_OPTIONS},
+            "Music Style": {"type": "multi_select", "options": MUSIC_STYLE_OPTIONS},
+            "Space Requirements": {"type": "rich_text"},
+            "Props Needed": {"type": "multi_select", "options": PROPS_NEEDED_OPTIONS},
+        }),
+        # Content-based columns
+        (None, (("content", "breathing"), ("content", "breath")), {
+            "Breathing Technique": {"type": "multi_select", "options": BREATHING_TECHNIQUE_OPTIONS},
+        }),
+        (None, (("content", "energy"), ("content", "chakra")), {
+            "Energy Focus": {"type": "multi_select", "options": ENERGY_FOCUS_OPTIONS},
+        }),
+        (None, (("content", "moon"), ("content", "lunar")), {
+            "Moon Phase": {"type": "select", "options": MOON_PHASE_OPTIONS},
+        }),
+        (None, (("content", "crystal"), ("content", "healing")), {
+            "Crystals Used": {"type": "multi_select", "options": CRYSTALS_USED_OPTIONS},
+        }),
+        # Action-based columns
+        (None, (("action", "collaboration"), ("content", "partner")), {
+            "Collaborators": {"type": "multi_select", "options": COLLABORATORS_OPTIONS},
+        }),
+        (None, (("action", "publish"), ("content", "share")), {
+            "Publishing Platform": {"type": "multi_select", "options": PUBLISHING_PLATFORM_OPTIONS},
+            "Ready to Publish": {"type": "checkbox"},
+        }),
+        # Universal useful columns
+        (None, (), {
+            "Priority Level": {"type": "select", "options": PRIORITY_LEVEL_OPTIONS},
+            "Inspiration Source": {"type": "rich_text"},
+            "Next Steps": {"type": "rich_text"},
+            "Resources Needed": {"type": "multi_select", "options": RESOURCES_NEEDED_OPTIONS},
+        }),
+    )
+)
+
+# Colours assigned to select options in order, wrapping around
+OPTION_COLORS = ("default", "gray", "brown", "orange", "yellow", "green", "blue", "purple", "pink", "red")
+
+
+@functools.lru_cache(maxsize=64)
+def _select_options(options: Tuple[str, ...]) -> Tuple[Dict[str, str], ...]:
+    """Notion select options payload for the given names (memoised; only ever serialised)"""
+    return tuple(
+        {"name": option, "color": OPTION_COLORS[i % len(OPTION_COLORS)]}
+        for i, option in enumerate(options)
+    )
+
+# Notion page ids: a UUID, with or without hyphens
+PAGE_ID_PATTERN = re.compile(r"[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}", re.IGNORECASE)
+
+# Notion rejects rich text objects longer than this many characters
+RICH_TEXT_LIMIT = 2000
+
+
+def _rich_text(*parts: str) -> List[Dict[str, Any]]:
+    """Rich text objects for the concatenation of parts, split to respect RICH_TEXT_LIMIT"""
+    return [
+        {"text": {"content": part[i:i + RICH_TEXT_LIMIT]}}
+        for part in parts if part
+        for i in range(0, len(part), RICH_TEXT_LIMIT)
+    ]
+
+
+def _tag_names(tags: Any) -> List[str]:
+    """Tag names from a list or a comma-separated string"""
+    if isinstance(tags, str):
+        return [tag.strip() for tag in tags.split(",") if tag.strip()]
+    return list(tags)
+
+
+def _timestamped(text: str) -> str:
+    """Prefix text with the current local time, as stored in Original Audio"""
+    return f"[{datetime.now().strftime('%Y-%m-%d %H:%M')}] {text}"
+
+
+# Project field -> (Notion property, payload builder); fields with empty values are not sent
+PROJECT_PROPERTY_BUILDERS: Mapping[str, Tuple[str, Callable[[Any], Dict[str, Any]]]] = MappingProxyType({
+    "name": ("Name", lambda value: {"title": [{"text": {"content": value}}]}),
+    "type": ("Type", lambda value: {"select": {"name": value}}),
+    "status": ("Status", lambda value: {"select": {"name": value}}),
+    "notes": ("Processed Notes", lambda value: {"rich_text": _rich_text(value)}),
+    "original_audio": ("Original Audio", lambda value: {"rich_text": _rich_text(_timestamped(value))}),
+    "tags": ("Tags", lambda value: {"multi_select": [{"name": tag} for tag in _tag_names(value)]}),
+})
+# Fields update_project_info may overwrite; notes are appended through add_notes_to_project instead
+PROJECT_INFO_FIELDS = frozenset({"name", "type", "status", "tags"})
+
+
+def _build_project_properties(data: Mapping[str, Any], fields: Optional[frozenset] = None) -> Dict[str, Any]:
+    """Notion properties for the known, non-empty project fields in data"""
+    properties = {}
+    for key, value in data.items():
+        builder = PROJECT_PROPERTY_BUILDERS.get(key)
+        if builder and value and (fields is None or key in fields):
+            name, build = builder
+            properties[name] = build(value)
+    return properties
+
 
 class NotionAPI:
     """Class for working with Notion API"""
 
-    def __init__(self):
-        self.config = Config()
+    # Keyword lookup cache settings
+    LOOKUP_CACHE_TTL = 45  # seconds
+    LOOKUP_CACHE_SIZE = 64
+    # Database read (query) cache lifetime; edits go through this bot and clear it
+    READ_CACHE_TTL = 60  # seconds
+    # Per-request timeout; also applied on the bot's shared session, whose own read timeout
+    # is sized for slow LLM generations rather than Notion
+    REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=5, sock_read=20)
+    # Transient failures (rate limit, gateway errors, dropped connections) are retried with backoff
+    MAX_RETRIES = 3
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    MAX_RETRY_DELAY = 30  # seconds
+    # Notion allows about three requests per second per integration
+    RATE_LIMIT_REQUESTS = 3
+    RATE_LIMIT_PERIOD = 1.0  # seconds
+    # Requests allowed on the wire at once, independent of the rate limit
+    MAX_CONCURRENT_REQUESTS = 4
+
+    def __init__(self, config: Optional[Config] = None, session: Optional[aiohttp.ClientSession] = None):
+        self.config = config or Config.get_instance()
         self.base_url = "https://api.notion.com/v1"
-        self.headers = {
-            "Authorization": f"Bearer {self.config.NOTION_TOKEN}",
-            "Content-Type": "application/json",
-            "Notion-Version": "2022-06-28"
-        }
+        self.headers = self.config.get_notion_headers()
+        # Shared pooled HTTP session; created lazily if none is injected
+        self.session = session
+        # The session this instance created itself (and so may close)
+        self._own_session: Optional[aiohttp.ClientSession] = None
+        self._lookup_cache: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._read_cache: Dict[tuple, tuple[float, Any]] = {}
+        # Loads in progress, shared by concurrent readers of the same key
+        self._read_inflight: Dict[tuple, asyncio.Task] = {}
+        # Bumped on every write so loads started before it are not cached
+        self._cache_generation = 0
+        # Lower-cased name -> first project with that name, for the cached list it was built from
+        self._name_index: Tuple[Optional[List[Dict[str, Any]]], Dict[str, Dict[str, Any]]] = (None, {})
+        # Start times of the last RATE_LIMIT_REQUESTS requests (sliding window)
+        self._request_times: "deque[float]" = deque(maxlen=self.RATE_LIMIT_REQUESTS)
+        self._rate_lock = asyncio.Lock()
+        # Set from Retry-After so every caller holds off, not just the one that got the 429
+        self._rate_limited_until = 0.0
+        self._request_slots = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled HTTP session, creating it on first use"""
+        if self.session is None or self.session.closed:
+            self.session = self._own_session = aiohttp.ClientSession(
+                # Same keep-alive and DNS caching as the bot's shared session, one socket per request slot
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=self.MAX_CONCURRENT_REQUESTS, keepalive_timeout=60, ttl_dns_cache=300
+                ),
+                timeout=self.REQUEST_TIMEOUT
+            )
+        return self.session
+
+    async def close(self) -> None:
+        """Close the HTTP session if this instance created it (an injected session belongs to its owner)"""
+        if self.session is self._own_session and self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def __aenter__(self) -> "NotionAPI":
+        self._get_session()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _wait_for_rate_limit(self) -> None:
+        """Wait until another request fits in the rate limit window"""
+        async with self._rate_lock:
+            now = time.monotonic()
+            delay = self._rate_limited_until - now
+            if len(self._request_times) == self.RATE_LIMIT_REQUESTS:
+                delay = max(delay, self._request_times[0] + self.RATE_LIMIT_PERIOD - now)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._request_times.append(time.monotonic())
 
     async def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Optional[Dict]:
         """Perform an HTTP request to the Notion API"""
         url = f"{self.base_url}/{endpoint}"
+        body = orjson.dumps(data) if data is not None else None
+        # Creating a page is the one call that must not be repeated if it may have reached Notion
+        idempotent = not (method == "POST" and endpoint == "pages")
 
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.request(
-                        method=method,
-                        url=url,
-                        headers=self.headers,
-                        json=data
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
+        for attempt in range(self.MAX_RETRIES + 1):
+            retry_after = None
+            await self._wait_for_rate_limit()
+            try:
+                async with self._request_slots:
+                    async with self._get_session().request(
+                            method=method,
+                            url=url,
+                            headers=self.headers,
+                            data=body,
+                            timeout=self.REQUEST_TIMEOUT
+                    ) as response:
+                        if 200 <= response.status < 300:
+                            return orjson.loads(await response.read())
                         error_text = await response.text()
-                        logger.error(f"Notion API error {response.status}: {error_text}")
-                        return None
-        except Exception as e:
-            logger.error(f"Error during request to Notion API: {e}")
-            return None
+                        retryable = response.status == 429 or (idempotent and response.status in self.RETRY_STATUSES)
+                        if not retryable or attempt == self.MAX_RETRIES:
+                            logger.error("Notion API error %s: %s", response.status, error_text)
+                            return None
+                        logger.warning("Notion API error %s (attempt %s), retrying", response.status, attempt + 1)
+                        if response.status == 429:
+                            retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                # A failed connect never sent the request; other failures may have
+                if attempt == self.MAX_RETRIES or not (idempotent or isinstance(e, aiohttp.ClientConnectorError)):
+                    logger.error("Error during request to Notion API: %s", e)
+                    return None
+                logger.warning("Notion API connection error (attempt %s), retrying: %s", attempt + 1, e)
+            except Exception as e:
+                logger.error("Error during request to Notion API: %s", e)
+                return None
+
+            try:
+                delay = min(self.MAX_RETRY_DELAY, float(retry_after))
+                self._rate_limited_until = max(self._rate_limited_until, time.monotonic() + delay)
+            except (TypeError, ValueError):
+                delay = min(self.MAX_RETRY_DELAY, 2 ** attempt + random.random())
+            await asyncio.sleep(delay)
+        return None
 
     async def create_project(self, project_data: Dict[str, Any]) -> Optional[Dict]:
         """Create a new project in Notion"""
@@ -57,41 +338,203 @@ class NotionAPI:
             }
             result = await self._make_request("POST", "pages", page_data)
             if result:
-                logger.info(f"Project created: {project_data.get('name', 'Untitled')}")
+                self._invalidate_caches()
+                logger.info("Project created: %s", project_data.get('name', 'Untitled'))
                 return result
             else:
-                logger.error(f"Failed to create project: {project_data}")
+                logger.error("Failed to create project: %s", project_data)
                 return None
         except Exception as e:
-            logger.error(f"Error creating project: {e}")
+            logger.error("Error creating project: %s", e)
             return None
 
+    def _get_cached_read(self, key: tuple) -> Optional[Any]:
+        """Return a cached query result if it is still fresh"""
+        cached = self._read_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.READ_CACHE_TTL:
+            return cached[1]
+        return None
+
+    async def _cached_read(self, key: tuple, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Serve a database read from the TTL cache; concurrent misses share a single load"""
+        cached = self._get_cached_read(key)
+        if cached is not None:
+            return cached
+
+        task = self._read_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load_and_cache(key, loader))
+            self._read_inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+        # Shielded so one cancelled caller does not cancel the load for the others
+        return await asyncio.shield(task)
+
+    async def _load_and_cache(self, key: tuple, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a read and cache non-empty results, unless the database changed meanwhile"""
+        generation = self._cache_generation
+        value = await loader()
+        if generation == self._cache_generation and value and (not isinstance(value, tuple) or value[0]):
+            self._read_cache[key] = (time.monotonic(), value)
+        return value
+
+    def _forget_inflight(self, key: tuple, task: asyncio.Task) -> None:
+        """Drop a finished load from the in-flight map"""
+        if self._read_inflight.get(key) is task:
+            del self._read_inflight[key]
+
     async def get_all_projects(self) -> List[Dict[str, Any]]:
-        """Get all projects from the database"""
+        """Get all projects from the database (cached for READ_CACHE_TTL)"""
+        return await self._cached_read(("all",), self._query_all_projects)
+
+    async def _query_all_projects(self) -> List[Dict[str, Any]]:
+        """Query all projects from the database"""
         try:
-            endpoint = f"databases/{self.config.NOTION_DATABASE_ID}/query"
-            query_data = {
-                "page_size": 100,
-                "sorts": [{"property": "Date", "direction": "descending"}]
-            }
-            result = await self._make_request("POST", endpoint, query_data)
-            if result:
-                projects = []
-                for page in result.get("results", []):
-                    project = self._parse_project_from_page(page)
-                    if project:
-                        projects.append(project)
-                logger.info(f"Projects retrieved: {len(projects)}")
-                return projects
-            else:
-                logger.error("Failed to retrieve projects")
-                return []
+            projects = await self._query_all_pages()
+            logger.debug("Projects retrieved: %s", len(projects))
+            return projects
+        except Exception as e:
+            logger.error("Error getting projects: %s", e)
+            return []
+
+    async def iter_projects(self, filter_: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield matching projects, fetching the next page (next_cursor) only when the caller gets that far"""
+        projects, cursor = await self._query_projects(filter_)
+        while True:
+            for project in projects:
+                yield project
+            if not cursor:
+                return
+            projects, cursor = await self._query_projects(filter_, start_cursor=cursor)
+
+    async def _query_all_pages(self, filter_: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Query every page of matching projects, following Notion's next_cursor (100 per request)"""
+        return [project async for project in self.iter_projects(filter_)]
+
+    async def _query_projects(
+        self,
+        filter_: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        start_cursor: Optional[str] = None,
+        page_size: int = 100
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Query one page of projects; returns (projects, next_cursor)"""
+        endpoint = f"databases/{self.config.NOTION_DATABASE_ID}/query"
+        query_data: Dict[str, Any] = {
+            "page_size": page_size,
+            "sorts": sorts or [{"property": "Date", "direction": "descending"}]
+        }
+        if filter_:
+            query_data["filter"] = filter_
+        if start_cursor:
+            query_data["start_cursor"] = start_cursor
+
+        result = await self._make_request("POST", endpoint, query_data)
+        if not result:
+            logger.error("Failed to query projects")
+            return [], None
+
+        projects = []
+        for page in result.get("results", []):
+            project = self._parse_project_from_page(page)
+            if project:
+                projects.append(project)
+        next_cursor = result.get("next_cursor") if result.get("has_more") else None
+        return projects, next_cursor
+
+    async def get_projects_page(
+        self,
+        cursor: Optional[str] = None,
+        page_size: int = 20,
+        status: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of projects (optionally with the given status); returns (projects, next_cursor)"""
+        try:
+            filter_ = {"property": "Status", "select": {"equals": status}} if status else None
+            return await self._cached_read(
+                ("page", cursor, page_size, status),
+                lambda: self._query_projects(filter_, start_cursor=cursor, page_size=page_size)
+            )
+        except Exception as e:
+            logger.error("Error getting projects page: %s", e)
+            return [], None
+
+    async def get_projects_by_status(self, status: str) -> List[Dict[str, Any]]:
+        """Get projects with the given status"""
+        try:
+            projects = await self._cached_read(
+                ("status", status),
+                lambda: self._query_all_pages({"property": "Status", "select": {"equals": status}})
+            )
+            logger.debug("Projects with status %s retrieved: %s", status, len(projects))
+            return projects
+        except Exception as e:
+            logger.error("Error getting projects by status: %s", e)
+            return []
+
+    async def get_projects_by_type(self, project_type: str) -> List[Dict[str, Any]]:
+        """Get projects of the given type"""
+        try:
+            projects = await self._cached_read(
+                ("type", project_type),
+                lambda: self._query_all_pages({"property": "Type", "select": {"equals": project_type}})
+            )
+            logger.debug("Projects of type %s retrieved: %s", project_type, len(projects))
+            return projects
+        except Exception as e:
+            logger.error("Error getting projects by type: %s", e)
+            return []
+
+    async def get_projects_matching(self, status: str, project_type: str) -> List[Dict[str, Any]]:
+        """Get projects with the given status and type (one compound query)"""
+        try:
+            filter_ = {"and": [
+                {"property": "Status", "select": {"equals": status}},
+                {"property": "Type", "select": {"equals": project_type}}
+            ]}
+            projects = await self._cached_read(
+                ("status+type", status, project_type),
+                lambda: self._query_all_pages(filter_)
+            )
+            logger.debug("Projects with status %s and type %s retrieved: %s", status, project_type, len(projects))
+            return projects
         except Exception as e:
-            logger.error(f"Error getting projects: {e}")
+            logger.error("Error getting projects by status and type: %s", e)
             return []
 
-# … файл продолжается с переводом всех методов ...
+    async def get_projects_grouped_by_type(
+        self,
+        cursor: Optional[str] = None,
+        page_size: int = 100
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Optional[str]]:
+        """Get a page of projects grouped by type; returns (groups, next_cursor)
 
+        Notion sorts by Type, so groups arrive contiguous and are built in one pass.
+        """
+        try:
+            projects, next_cursor = await self._cached_read(
+                ("by_type", cursor, page_size),
+                lambda: self._query_projects(
+                    sorts=[
+                        {"property": "Type", "direction": "ascending"},
+                        {"property": "Date", "direction": "descending"}
+                    ],
+                    start_cursor=cursor,
+                    page_size=page_size
+                )
+            )
+            grouped: Dict[str, List[Dict[str, Any]]] = {}
+            current_type, current_group = None, None
+            for project in projects:
+                project_type = project["type"] or "Other"
+                if project_type != current_type:
+                    current_type = project_type
+                    current_group = grouped.setdefault(project_type, [])
+                current_group.append(project)
+            logger.debug("Projects retrieved in %s groups", len(grouped))
+            return grouped, next_cursor
+        except Exception as e:
+            logger.error("Error getting grouped projects: %s", e)
+            return {}, None
 
     async def get_active_projects(self) -> List[Dict[str, Any]]:
         """Get only active projects (not archived)"""
@@ -114,349 +557,415 @@ class NotionAPI:
                     project = self._parse_project_from_page(page)
                     if project:
                         projects.append(project)
-                logger.info(f"Active projects retrieved: {len(projects)}")
+                logger.debug("Active projects retrieved: %s", len(projects))
                 return projects
             else:
                 logger.error("Failed to retrieve active projects")
                 return []
         except Exception as e:
-            logger.error(f"Error getting active projects: {e}")
+            logger.error("Error getting active projects: %s", e)
             return []
 
+    async def _patch_page(self, page_id: str, properties: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update properties of one page and write the result through the caches; returns the updated page.
+
+        Independent pages can be patched concurrently with asyncio.gather.
+        """
+        result = await self._make_request("PATCH", f"pages/{page_id}", {"properties": properties})
+        if result:
+            self._invalidate_caches(result)
+        return result
+
     async def update_project_status(self, project_id: str, new_status: str) -> bool:
         """Update project status"""
         try:
-            endpoint = f"pages/{project_id}"
-            update_data = {
-                "properties": {
-                    "Status": {
-                        "select": {"name": new_status}
-                    }
-                }
-            }
-            result = await self._make_request("PATCH", endpoint, update_data)
+            result = await self._patch_page(project_id, {"Status": {"select": {"name": new_status}}})
             if result:
-                logger.info(f"Project status updated to: {new_status}")
+                logger.info("Project status updated to: %s", new_status)
                 return True
             else:
-                logger.error(f"Failed to update project status")
+                logger.error("Failed to update project status")
                 return False
         except Exception as e:
-            logger.error(f"Error updating project status: {e}")
+            logger.error("Error updating project status: %s", e)
             return False
 
+    async def get_page(self, page_id: str) -> Optional[Dict[str, Any]]:
+        """Get one project by page id (from the cached list if loaded, otherwise pages/{id})"""
+        projects = self._get_cached_read(("all",))
+        if projects is not None:
+            normalized_id = page_id.replace("-", "")
+            for project in projects:
+                if (project.get("id") or "").replace("-", "") == normalized_id:
+                    return project
+        return await self.fetch_page(page_id)
+
+    async def resolve_project(self, project_identifier: str) -> Optional[Dict[str, Any]]:
+        """Find a project by page id when given one, otherwise by keywords"""
+        if PAGE_ID_PATTERN.fullmatch(project_identifier.strip()):
+            return await self.get_page(project_identifier.strip())
+        return await self.find_project_by_keywords(project_identifier)
+
+    async def find_and_update_project_status(self, project_identifier: str, new_status: str) -> Optional[Dict[str, Any]]:
+        """Find project by keywords and update its status; returns the project on success"""
+        try:
+            project = await self.resolve_project(project_identifier)
+            if not project:
+                logger.error("Project not found: %s", project_identifier)
+                return None
+
+            if await self.update_project_status(project['id'], new_status):
+                return project
+            return None
+        except Exception as e:
+            logger.error("Error finding and updating project status: %s", e)
+            return None
+
+    async def _iter_by_title(self, text: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield projects whose name contains text (case-insensitive), filtered by Notion unless the full list is cached"""
+        projects = self._get_cached_read(("all",))
+        if projects is not None:
+            text_lower = text.lower()
+            for project in projects:
+                if text_lower in project.get("name", "").lower():
+                    yield project
+            return
+        async for project in self.iter_projects({"property": "Name", "title": {"contains": text}}):
+            yield project
+
+    def _cached_name_index(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Name index over the cached project list, or None when no list is cached"""
+        projects = self._get_cached_read(("all",))
+        if projects is None:
+            return None
+        indexed, index = self._name_index
+        if indexed is not projects:
+            index = {}
+            for project in projects:
+                index.setdefault(project.get("name", "").lower(), project)
+            self._name_index = (projects, index)
+        return index
+
     async def find_project_by_name(self, project_name: str) -> Optional[Dict[str, Any]]:
         """Find project by exact name match"""
         try:
-            projects = await self.get_all_projects()
-            for project in projects:
-                if project.get("name", "").lower() == project_name.lower():
+            project_name_lower = project_name.lower()
+            index = self._cached_name_index()
+            if index is not None:
+                return index.get(project_name_lower)
+            
+            # Notion's "equals" is case-sensitive, so narrow with "contains" and compare here
+            # Stops at the first hit, so later result pages are never fetched
+            async for project in self._iter_by_title(project_name):
+                if project.get("name", "").lower() == project_name_lower:
                     return project
             return None
         except Exception as e:
-            logger.error(f"Error finding project by name: {e}")
+            logger.error("Error finding project by name: %s", e)
             return None
 
     async def find_project_by_keywords(self, keywords: str) -> Optional[Dict[str, Any]]:
+        """Find project by keywords in name, type, or notes (results cached briefly)"""
+        cache_key = keywords.strip().lower()
+        cached = self._lookup_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self.LOOKUP_CACHE_TTL:
+            self._lookup_cache.move_to_end(cache_key)
+            return cached[1]
+
+        # Concurrent lookups for the same keywords share one search
+        inflight_key = ("lookup", cache_key)
+        task = self._read_inflight.get(inflight_key)
+        if task is None:
+            task = asyncio.create_task(self._search_and_cache(keywords, cache_key))
+            self._read_inflight[inflight_key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(inflight_key, done))
+        return await asyncio.shield(task)
+
+    async def _search_and_cache(self, keywords: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Run a keyword search and cache a hit, unless the database changed meanwhile"""
+        generation = self._cache_generation
+        project = await self._find_project_by_keywords(keywords)
+        if project and generation == self._cache_generation:
+            self._lookup_cache[cache_key] = (time.monotonic(), project)
+            self._lookup_cache.move_to_end(cache_key)
+            while len(self._lookup_cache) > self.LOOKUP_CACHE_SIZE:
+                self._lookup_cache.popitem(last=False)
+        return project
+
+    def _invalidate_caches(self, updated_page: Optional[Dict[str, Any]] = None) -> None:
+        """Drop cached reads and lookups after a change to the database.
+
+        When the change was a single page update, the page returned by Notion is
+        written through into the cached project list so the next lookup stays local.
+        """
+        all_cached = self._read_cache.get(("all",))
+        self._cache_generation += 1
+        self._read_cache.clear()
+        self._read_inflight.clear()
+        self._lookup_cache.clear()
+        self._name_index = (None, {})
+
+        if updated_page and all_cached:
+            updated = self._parse_project_from_page(updated_page)
+            if updated:
+                projects = [updated if project["id"] == updated["id"] else project for project in all_cached[1]]
+                self._read_cache[("all",)] = (all_cached[0], projects)
+
+    async def _find_project_by_keywords(self, keywords: str) -> Optional[Dict[str, Any]]:
         """Find project by keywords in name, type, or notes"""
         try:
-            projects = await self.get_all_projects()
             keywords_lower = keywords.lower()
+            # A name match outranks type and notes, so ask Notion for name matches first
+            # and only scan the full list when no name contains the keywords
+            index = self._cached_name_index()
+            if index is not None and keywords_lower in index:
+                return index[keywords_lower]
+            if keywords.strip():
+                partial = None
+                async for project in self._iter_by_title(keywords):
+                    if project.get("name", "").lower() == keywords_lower:
+                        return project
+                    if partial is None:
+                        partial = project
+                if partial is not None:
+                    return partial
             
-            # First try exact name match
-            for project in projects:
-                if project.get("name", "").lower() == keywords_lower:
-                    return project
-            
-            # Then try partial matches in name
-            for project in projects:
-                if keywords_lower in project.get("name", "").lower():
-                    return project
+            projects = self._get_cached_read(("all",))
+            if projects is None and keywords.strip():
+                projects = await self._query_type_or_notes(keywords)
+            if projects is None:
+                projects = await self.get_all_projects()
             
-            # Then try matches in type
+            # One pass, by priority: exact name, then partial name, type, notes (first project wins per level)
+            best_rank, best = 4, None
             for project in projects:
-                if keywords_lower in project.get("type", "").lower():
+                name = project.get("name", "").lower()
+                if name == keywords_lower:
                     return project
+                if best_rank > 1 and keywords_lower in name:
+                    best_rank, best = 1, project
+                elif best_rank > 2 and keywords_lower in project.get("type", "").lower():
+                    best_rank, best = 2, project
+                elif best_rank > 3 and keywords_lower in project.get("notes", "").lower():
+                    best_rank, best = 3, project
             
-            # Finally try matches in notes
-            for project in projects:
-                if keywords_lower in project.get("notes", "").lower():
-                    return project
-            
-            return None
+            return best
         except Exception as e:
-            logger.error(f"Error finding project by keywords: {e}")
+            logger.error("Error finding project by keywords: %s", e)
             return None
 
-    async def add_notes_to_project(self, project_identifier: str, update_data: Dict[str, Any]) -> bool:
+    async def _query_type_or_notes(self, keywords: str) -> Optional[List[Dict[str, Any]]]:
+        """Projects whose type or notes contain keywords, filtered by Notion; None if no filter can be built"""
+        schema = await self.get_database_schema()
+        if not schema:
+            return None
+        
+        keywords_lower = keywords.lower()
+        # Select filters only match whole values, so pick the type options that contain the keywords
+        type_options = ((schema.get("Type") or {}).get("select") or {}).get("options") or ()
+        conditions = [
+            {"property": "Type", "select": {"equals": option["name"]}}
+            for option in type_options
+            if keywords_lower in option.get("name", "").lower()
+        ]
+        if "Processed Notes" in schema:
+            conditions.append({"property": "Processed Notes", "rich_text": {"contains": keywords}})
+        
+        if not conditions:
+            return []
+        return await self._query_all_pages(conditions[0] if len(conditions) == 1 else {"or": conditions})
+
+    async def add_notes_to_project(self, project_identifier: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Add notes to existing project with support for both Original Audio and Processed Notes"""
         try:
-            # Find project by keywords
-            project = await self.find_project_by_keywords(project_identifier)
+            project = await self.resolve_project(project_identifier)
             if not project:
-                logger.error(f"Project not found: {project_identifier}")
-                return False
-            
-            # Prepare update properties
-            properties = {}
-            
-            # Handle Original Audio updates
-            if 'original_audio' in update_data:
-                current_original_audio = project.get("original_audio", "")
-                new_audio = update_data['original_audio']
-                
-                # Add timestamp to new audio
-                from datetime import datetime
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-                timestamped_audio = f"[{timestamp}] {new_audio}"
-                
-                if current_original_audio:
-                    updated_original_audio = f"{current_original_audio}\n\n--- New Audio ---\n{timestamped_audio}"
-                else:
-                    updated_original_audio = timestamped_audio
-                
-                properties["Original Audio"] = {
-                    "rich_text": [{"text": {"content": updated_original_audio}}]
-                }
-            
-            # Handle Processed Notes updates
-            if 'additional_notes' in update_data:
-                current_notes = project.get("notes", "")  # This reads from "notes" which maps to "Processed Notes"
-                additional_notes = update_data['additional_notes']
-                note_type = update_data.get('note_type', 'update')
-                
-                # Format the new note with timestamp and type
-                from datetime import datetime
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-                formatted_note = f"[{timestamp}] {note_type.title()}: {additional_notes}"
-                
-                if current_notes:
-                    updated_notes = f"{current_notes}\n\n{formatted_note}"
-                else:
-                    updated_notes = formatted_note
-                
-                properties["Processed Notes"] = {
-                    "rich_text": [{"text": {"content": updated_notes}}]
-                }
+                logger.error("Project not found: %s", project_identifier)
+                return None
+
+            if await self._append_notes(project, update_data):
+                return project
+            return None
+
+        except Exception as e:
+            logger.error("Error adding notes to project: %s", e)
+            return None
+
+    async def add_notes_to_page(self, page_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Add notes to the project with the given page id; returns the project on success"""
+        try:
+            # Read the page fresh: its notes are rewritten from the current text plus the new entry
+            project = await self.fetch_page(page_id)
+            if not project:
+                logger.error("Project not found: %s", page_id)
+                return None
+
+            if await self._append_notes(project, update_data):
+                return project
+            return None
+
+        except Exception as e:
+            logger.error("Error adding notes to project: %s", e)
+            return None
+
+    async def fetch_page(self, page_id: str) -> Optional[Dict[str, Any]]:
+        """Load one project straight from Notion (pages/{id}), bypassing the caches"""
+        result = await self._make_request("GET", f"pages/{page_id}")
+        return self._parse_project_from_page(result) if result else None
+
+    async def _append_notes(self, project: Dict[str, Any], update_data: Dict[str, Any]) -> bool:
+        """Append Original Audio / Processed Notes to an already-loaded project (one PATCH, no lookup)"""
+        try:
+            properties = self._build_notes_properties(project, update_data)
             
             # If no properties to update, return success
             if not properties:
                 logger.info("No properties to update")
                 return True
             
-            # Update project
-            endpoint = f"pages/{project['id']}"
-            update_request = {"properties": properties}
-            
-            result = await self._make_request("PATCH", endpoint, update_request)
+            # Update project (all changed properties in a single PATCH)
+            result = await self._patch_page(project['id'], properties)
             if result:
-                logger.info(f"Notes added to project: {project['name']}")
+                logger.info("Notes added to project: %s", project['name'])
                 return True
             else:
-                logger.error(f"Failed to add notes to project")
+                logger.error("Failed to add notes to project")
                 return False
                 
         except Exception as e:
-            logger.error(f"Error adding notes to project: {e}")
+            logger.error("Error adding notes to project: %s", e)
             return False
 
-    async def update_project_info(self, project_identifier: str, updates: Dict[str, str]) -> bool:
-        """Update project information (name, type, etc.)"""
-        try:
-            # Find project by keywords
-            project = await self.find_project_by_keywords(project_identifier)
-            if not project:
-                logger.error(f"Project not found: {project_identifier}")
-                return False
-            
-            # Prepare update data
-            properties = {}
+    def _build_notes_properties(self, project: Dict[str, Any], update_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build Original Audio / Processed Notes properties with new entries appended"""
+        properties = {}
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+        
+        # Handle Original Audio updates
+        if 'original_audio' in update_data:
+            current_original_audio = project.get("original_audio", "")
+            timestamped_audio = f"[{timestamp}] {update_data['original_audio']}"
+            separator = "\n\n--- New Audio ---\n" if current_original_audio else ""
             
-            if "name" in updates:
-                properties["Name"] = {
-                    "title": [{"text": {"content": updates["name"]}}]
-                }
+            # The history is sent as its own segments rather than copied into one new string
+            properties["Original Audio"] = {
+                "rich_text": _rich_text(current_original_audio, separator, timestamped_audio)
+            }
+        
+        # Handle Processed Notes updates
+        if 'additional_notes' in update_data:
+            current_notes = project.get("notes", "")  # This reads from "notes" which maps to "Processed Notes"
+            note_type = update_data.get('note_type', 'update')
+            formatted_note = f"[{timestamp}] {note_type.title()}: {update_data['additional_notes']}"
+            separator = "\n\n" if current_notes else ""
             
-            if "type" in updates:
-                properties["Type"] = {
-                    "select": {"name": updates["type"]}
-                }
+            properties["Processed Notes"] = {
+                "rich_text": _rich_text(current_notes, separator, formatted_note)
+            }
+        
+        return properties
+
+    async def update_project_info(self, project_identifier: str, updates: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Update project information (name, type, etc.); returns the project on success"""
+        try:
+            project = await self.resolve_project(project_identifier)
+            if not project:
+                logger.error("Project not found: %s", project_identifier)
+                return None
             
-            if "status" in updates:
-                properties["Status"] = {
-                    "select": {"name": updates["status"]}
-                }
+            properties = _build_project_properties(updates, PROJECT_INFO_FIELDS)
             
-            # Update project
-            endpoint = f"pages/{project['id']}"
-            update_data = {"properties": properties}
+            if not properties:
+                logger.info("No project info to update")
+                return None
             
-            result = await self._make_request("PATCH", endpoint, update_data)
+            # Update project (all changed properties in a single PATCH)
+            result = await self._patch_page(project['id'], properties)
             if result:
-                logger.info(f"Project info updated: {project['name']}")
-                return True
+                logger.info("Project info updated: %s", project['name'])
+                return project
             else:
-                logger.error(f"Failed to update project info")
-                return False
+                logger.error("Failed to update project info")
+                return None
                 
         except Exception as e:
-            logger.error(f"Error updating project info: {e}")
-            return False
+            logger.error("Error updating project info: %s", e)
+            return None
 
-    async def archive_project(self, project_identifier: str, reason: str = "") -> bool:
-        """Archive project by setting status to Archived"""
+    async def archive_project(self, project_identifier: str, reason: str = "") -> Optional[Dict[str, Any]]:
+        """Archive project by setting status to Archived; returns the project on success"""
         try:
-            # Find project by keywords
-            project = await self.find_project_by_keywords(project_identifier)
+            project = await self.resolve_project(project_identifier)
             if not project:
-                logger.error(f"Project not found: {project_identifier}")
-                return False
-            
-            # Update status to Archived
-            success = await self.update_project_status(project['id'], "Archived")
+                logger.error("Project not found: %s", project_identifier)
+                return None
             
-            # Optionally add archive reason to notes
-            if success and reason:
+            # Status change and optional archive reason go out in one PATCH
+            properties = {"Status": {"select": {"name": "Archived"}}}
+            if reason:
                 archive_data = {
                     'additional_notes': f"Archived: {reason}",
                     'note_type': 'archive'
                 }
-                await self.add_notes_to_project(project_identifier, archive_data)
+                properties.update(self._build_notes_properties(project, archive_data))
+            
+            result = await self._patch_page(project['id'], properties)
+            if not result:
+                logger.error("Failed to archive project")
+                return None
             
-            return success
+            logger.info("Project archived: %s", project['name'])
+            return project
                 
         except Exception as e:
-            logger.error(f"Error archiving project: {e}")
-            return False
+            logger.error("Error archiving project: %s", e)
+            return None
 
     async def get_project_details(self, project_identifier: str) -> Optional[Dict[str, Any]]:
         """Get detailed project information"""
         try:
-            project = await self.find_project_by_keywords(project_identifier)
+            project = await self.resolve_project(project_identifier)
             return project
         except Exception as e:
-            logger.error(f"Error getting project details: {e}")
+            logger.error("Error getting project details: %s", e)
             return None
 
     def _prepare_project_properties(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare project properties for Notion API (works with existing columns only)"""
-        properties = {}
-        
-        # Project name (required field)
-        if "name" in project_data:
-            properties["Name"] = {
-                "title": [{"text": {"content": project_data["name"]}}]
-            }
-        
-        # Project type
-        if "type" in project_data:
-            properties["Type"] = {
-                "select": {"name": project_data["type"]}
-            }
-        
-        # Project status
-        if "status" in project_data:
-            properties["Status"] = {
-                "select": {"name": project_data["status"]}
-            }
-        
-        # Processed Notes - structured notes
-        if "notes" in project_data:
-            properties["Processed Notes"] = {
-                "rich_text": [{"text": {"content": project_data["notes"]}}]
-            }
-        
-        # Original Audio - raw transcriptions with timestamp
-        if "original_audio" in project_data:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-            timestamped_audio = f"[{timestamp}] {project_data['original_audio']}"
-            properties["Original Audio"] = {
-                "rich_text": [{"text": {"content": timestamped_audio}}]
-            }
-        
-        # Tags
-        if "tags" in project_data and project_data["tags"]:
-            tag_objects = []
-            for tag in project_data["tags"]:
-                tag_objects.append({"name": tag})
-            properties["Tags"] = {"multi_select": tag_objects}
-        
-        return properties
+        return _build_project_properties(project_data)
 
     def _parse_project_from_page(self, page: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Parse project data from Notion page"""
         try:
-            properties = page.get("properties", {})
+            properties = page.get("properties") or {}
+            # Missing or empty properties come back as None/[]; fall through to "" rather than raising
+            title = (properties.get("Name") or {}).get("title")
+            type_ = (properties.get("Type") or {}).get("select")
+            status = (properties.get("Status") or {}).get("select")
+            notes = (properties.get("Processed Notes") or {}).get("rich_text") or ()
+            original_audio = (properties.get("Original Audio") or {}).get("rich_text") or ()
+            tags = (properties.get("Tags") or {}).get("multi_select") or ()
             
-            project = {
+            return {
                 "id": page.get("id"),
-                "name": self._extract_title(properties.get("Name", {})),
-                "type": self._extract_select(properties.get("Type", {})),
-                "status": self._extract_select(properties.get("Status", {})),
-                "notes": self._extract_rich_text(properties.get("Processed Notes", {})),
-                "original_audio": self._extract_rich_text(properties.get("Original Audio", {})),
-                "tags": self._extract_multi_select(properties.get("Tags", {})),
+                "name": (title[0].get("text") or {}).get("content", "") if title else "",
+                # Select values repeat across every cached project: share one string object each
+                "type": sys.intern(type_.get("name", "")) if type_ else "",
+                "status": sys.intern(status.get("name", "")) if status else "",
+                "notes": "".join((part.get("text") or {}).get("content", "") for part in notes),
+                "original_audio": "".join((part.get("text") or {}).get("content", "") for part in original_audio),
+                "tags": [sys.intern(tag.get("name", "")) for tag in tags],
                 "created_time": page.get("created_time"),
                 "last_edited_time": page.get("last_edited_time")
             }
             
-            return project
-            
         except Exception as e:
-            logger.error(f"Error parsing project from page: {e}")
+            logger.error("Error parsing project from page: %s", e)
             return None
 
-    def _extract_title(self, title_property: Dict[str, Any]) -> str:
-        """Extract title from Notion title property"""
-        try:
-            title_list = title_property.get("title", [])
-            if title_list:
-                return title_list[0].get("text", {}).get("content", "")
-            return ""
-        except Exception:
-            return ""
-
-    def _extract_select(self, select_property: Dict[str, Any]) -> str:
-        """Extract value from Notion select property"""
-        try:
-            select_obj = select_property.get("select")
-            if select_obj:
-                return select_obj.get("name", "")
-            return ""
-        except Exception:
-            return ""
-
-    def _extract_rich_text(self, rich_text_property: Dict[str, Any]) -> str:
-        """Extract text from Notion rich text property"""
-        try:
-            rich_text_list = rich_text_property.get("rich_text", [])
-            text_parts = []
-            for text_obj in rich_text_list:
-                text_parts.append(text_obj.get("text", {}).get("content", ""))
-            return "".join(text_parts)
-        except Exception:
-            return ""
-
-    def _extract_multi_select(self, multi_select_property: Dict[str, Any]) -> List[str]:
-        """Extract values from Notion multi-select property"""
-        try:
-            multi_select_list = multi_select_property.get("multi_select", [])
-            return [item.get("name", "") for item in multi_select_list]
-        except Exception:
-            return []
-
     def _get_status_emoji(self, status: str) -> str:
         """Get emoji for project status"""
-        status_emojis = {
-            "Idea": "💡",
-            "Planning": "📋", 
-            "In Progress": "🔄",
-            "On Hold": "⏸️",
-            "Completed": "✅",
-            "Archived": "📦"
-        }
-        return status_emojis.get(status, "📄")
+        return STATUS_EMOJIS.get(status, "📄")
 
 
     # ========================================
@@ -464,112 +973,125 @@ class NotionAPI:
     # ========================================
     
     async def get_database_schema(self) -> Optional[Dict[str, Any]]:
-        """Get current database schema/properties"""
+        """Get current database schema/properties (cached for READ_CACHE_TTL)"""
         try:
-            endpoint = f"databases/{self.config.NOTION_DATABASE_ID}"
-            result = await self._make_request("GET", endpoint)
-            
-            if result:
-                properties = result.get("properties", {})
-                logger.info(f"Retrieved database schema with {len(properties)} properties")
-                return properties
-            else:
-                logger.error("Failed to retrieve database schema")
-                return None
-                
+            return await self._cached_read(("schema",), self._query_database_schema)
         except Exception as e:
-            logger.error(f"Error getting database schema: {e}")
+            logger.error("Error getting database schema: %s", e)
+            return None
+
+    async def _query_database_schema(self) -> Optional[Dict[str, Any]]:
+        """Request the database schema/properties from Notion"""
+        endpoint = f"databases/{self.config.NOTION_DATABASE_ID}"
+        result = await self._make_request("GET", endpoint)
+        
+        if result:
+            properties = result.get("properties", {})
+            logger.debug("Retrieved database schema with %s properties", len(properties))
+            return properties
+        else:
+            logger.error("Failed to retrieve database schema")
             return None
     
-    async def property_exists(self, property_name: str) -> bool:
-        """Check if property already exists in database"""
+    def _store_schema(self, database: Dict[str, Any]) -> None:
+        """Cache the schema from a database object returned by a schema PATCH"""
+        # Newly added (empty) columns do not change any parsed project, so only the schema is replaced;
+        # the generation bump keeps a schema read that started before the PATCH from caching over it
+        self._cache_generation += 1
+        self._read_inflight.pop(("schema",), None)
+        properties = database.get("properties")
+        if properties:
+            self._read_cache[("schema",)] = (time.monotonic(), properties)
+        else:
+            self._read_cache.pop(("schema",), None)
+
+    async def property_exists(self, property_name: str, schema: Optional[Dict[str, Any]] = None) -> bool:
+        """Check if property already exists in database (in the given schema, if already loaded)"""
         try:
-            schema = await self.get_database_schema()
+            if schema is None:
+                schema = await self.get_database_schema()
             if schema:
                 return property_name in schema
             return False
         except Exception as e:
-            logger.error(f"Error checking property existence: {e}")
+            logger.error("Error checking property existence: %s", e)
             return False
     
-    async def create_optimal_property(self, property_name: str, property_type: str, options: List[str] = None) -> bool:
+    async def create_optimal_property(
+        self,
+        property_name: str,
+        property_type: str,
+        options: List[str] = None,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """Create optimal property based on type and content"""
+        results = await self.create_properties_bulk(
+            {property_name: {"type": property_type, "options": options}}, schema
+        )
+        return results.get(property_name, False)
+    
+    def _build_property_config(self, property_type: str, options: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Build the Notion property configuration for a column type"""
+        if property_type == "text" or property_type == "rich_text":
+            return {"rich_text": {}}
+        
+        elif property_type == "select":
+            return {"select": {"options": _select_options(tuple(options or ("Option 1", "Option 2", "Option 3")))}}
+        
+        elif property_type == "multi_select":
+            return {"multi_select": {"options": _select_options(tuple(options or ("Tag 1", "Tag 2", "Tag 3")))}}
+        
+        elif property_type == "number":
+            return {"number": {"format": "number"}}
+        
+        elif property_type == "date":
+            return {"date": {}}
+        
+        elif property_type == "checkbox":
+            return {"checkbox": {}}
+        
+        elif property_type == "url":
+            return {"url": {}}
+        
+        # Default to rich text
+        return {"rich_text": {}}
+    
+    async def create_properties_bulk(
+        self,
+        columns: Mapping[str, Mapping[str, Any]],
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, bool]:
+        """Create every missing column in a single PATCH; returns {column name: exists now}"""
         try:
-            if await self.property_exists(property_name):
-                logger.info(f"Property '{property_name}' already exists")
-                return True
+            if schema is None:
+                schema = await self.get_database_schema() or {}
             
-            endpoint = f"databases/{self.config.NOTION_DATABASE_ID}"
-            
-            # Determine optimal property configuration
-            if property_type == "text" or property_type == "rich_text":
-                property_config = {"rich_text": {}}
-            
-            elif property_type == "select":
-                if not options:
-                    options = ["Option 1", "Option 2", "Option 3"]
-                
-                colors = ["default", "gray", "brown", "orange", "yellow", "green", "blue", "purple", "pink", "red"]
-                select_options = []
-                for i, option in enumerate(options):
-                    select_options.append({
-                        "name": option,
-                        "color": colors[i % len(colors)]
-                    })
-                property_config = {"select": {"options": select_options}}
-            
-            elif property_type == "multi_select":
-                if not options:
-                    options = ["Tag 1", "Tag 2", "Tag 3"]
-                
-                colors = ["default", "gray", "brown", "orange", "yellow", "green", "blue", "purple", "pink", "red"]
-                select_options = []
-                for i, option in enumerate(options):
-                    select_options.append({
-                        "name": option,
-                        "color": colors[i % len(colors)]
-                    })
-                property_config = {"multi_select": {"options": select_options}}
-            
-            elif property_type == "number":
-                property_config = {"number": {"format": "number"}}
-            
-            elif property_type == "date":
-                property_config = {"date": {}}
-            
-            elif property_type == "checkbox":
-                property_config = {"checkbox": {}}
-            
-            elif property_type == "url":
-                property_config = {"url": {}}
-            
-            else:
-                # Default to rich text
-                property_config = {"rich_text": {}}
-            
-            update_data = {
-                "properties": {
-                    property_name: property_config
-                }
+            new_properties = {
+                name: self._build_property_config(config["type"], config.get("options"))
+                for name, config in columns.items()
+                if name not in schema
             }
+            results = {name: True for name in columns if name in schema}
+            if not new_properties:
+                return results
             
-            result = await self._make_request("PATCH", endpoint, update_data)
+            endpoint = f"databases/{self.config.NOTION_DATABASE_ID}"
+            result = await self._make_request("PATCH", endpoint, {"properties": new_properties})
             if result:
-                logger.info(f"Created optimal property: {property_name} ({property_type})")
-                return True
+                self._store_schema(result)
+                logger.info("Created properties: %s", ", ".join(new_properties))
             else:
-                logger.error(f"Failed to create property: {property_name}")
-                return False
-                
+                logger.error("Failed to create properties: %s", ", ".join(new_properties))
+            results.update((name, bool(result)) for name in new_properties)
+            return results
+            
         except Exception as e:
-            logger.error(f"Error creating optimal property: {e}")
-            return False
+            logger.error("Error creating properties: %s", e)
+            return {name: False for name in columns}
     
     async def analyze_and_create_optimal_columns(self, request_analysis: Dict[str, Any]) -> Dict[str, bool]:
         """Analyze request and create optimal columns automatically"""
         try:
-            created_columns = {}
-            
             # Extract potential column needs from request analysis
             project_type = request_analysis.get("project_type", "").lower()
             content = request_analysis.get("content", "").lower()
@@ -578,205 +1100,71 @@ class NotionAPI:
             # Analyze what columns would be optimal for this type of request
             optimal_columns = self._determine_optimal_columns(project_type, content, action)
             
-            # Create each optimal column
-            for column_name, column_config in optimal_columns.items():
-                success = await self.create_optimal_property(
-                    column_name, 
-                    column_config["type"], 
-                    column_config.get("options")
-                )
-                created_columns[column_name] = success
-                
+            # Create all missing columns in one schema update
+            created_columns = await self.create_properties_bulk(optimal_columns)
+            
+            for column_name, success in created_columns.items():
                 if success:
-                    logger.info(f"✅ Created optimal column: {column_name}")
+                    logger.info("✅ Created optimal column: %s", column_name)
                 else:
-                    logger.warning(f"❌ Failed to create column: {column_name}")
+                    logger.warning("❌ Failed to create column: %s", column_name)
             
             return created_columns
             
         except Exception as e:
-            logger.error(f"Error analyzing and creating optimal columns: {e}")
+            logger.error("Error analyzing and creating optimal columns: %s", e)
             return {}
     
-    def _determine_optimal_columns(self, project_type: str, content: str, action: str) -> Dict[str, Dict[str, Any]]:
-        """Determine what columns would be optimal for this request"""
-        optimal_columns = {}
-        
-        # Always useful columns for detailed tracking
-        optimal_columns["Original Transcription"] = {
-            "type": "rich_text"
-        }
-        optimal_columns["Processed Notes"] = {
-            "type": "rich_text"
-        }
-        
-        # Project type specific columns
-        if "song" in project_type or "music" in content:
-            optimal_columns["Key Signature"] = {
-                "type": "select",
-                "options": ["C Major", "G Major", "D Major", "A Major", "E Major", "B Major", "F# Major", "C# Major", "F Major", "Bb Major", "Eb Major", "Ab Major", "Db Major", "Gb Major", "Cb Major"]
-            }
-            optimal_columns["Tempo"] = {
-                "type": "number"
-            }
-            optimal_columns["Duration"] = {
-                "type": "rich_text"
-            }
-            optimal_columns["Instruments"] = {
-                "type": "multi_select",
-                "options": ["Piano", "Guitar", "Vocals", "Drums", "Bass", "Strings", "Synth", "Flute", "Violin"]
-            }
-            optimal_columns["Mood"] = {
-                "type": "select",
-                "options": ["Peaceful", "Energetic", "Melancholic", "Joyful", "Mysterious", "Romantic", "Powerful", "Dreamy"]
-            }
-        
-        elif "workshop" in project_type or "course" in project_type or "class" in content:
-            optimal_columns["Duration"] = {
-                "type": "rich_text"
-            }
-            optimal_columns["Participants"] = {
-                "type": "number"
-            }
-            optimal_columns["Location"] = {
-                "type": "rich_text"
-            }
-            optimal_columns["Materials Needed"] = {
-                "type": "multi_select",
-                "options": ["Mats", "Music", "Props", "Handouts", "Projector", "Microphone", "Candles", "Crystals"]
-            }
-            optimal_columns["Energy Level"] = {
-                "type": "select",
-                "options": ["Gentle", "Moderate", "High Energy", "Mixed", "Restorative"]
-            }
-            optimal_columns["Focus Area"] = {
-                "type": "select",
-                "options": ["Movement", "Breathing", "Meditation", "Expression", "Healing", "Connection", "Creativity"]
-            }
-        
-        elif "retreat" in project_type or "event" in content:
-            optimal_columns["Start Date"] = {
-                "type": "date"
-            }
-            optimal_columns["End Date"] = {
-                "type": "date"
-            }
-            optimal_columns["Location"] = {
-                "type": "rich_text"
-            }
-            optimal_columns["Capacity"] = {
-                "type": "number"
-            }
-            optimal_columns["Price"] = {
-                "type": "number"
-            }
-            optimal_columns["Accommodation"] = {
-                "type": "select",
-                "options": ["Included", "Not Included", "Optional", "Camping", "Hotel", "Shared Rooms"]
-            }
-            optimal_columns["Meals"] = {
-                "type": "select",
-                "options": ["All Included", "Breakfast Only", "Not Included", "Vegetarian", "Vegan", "Raw Food"]
-            }
-        
-        elif "dance" in content or "movement" in content:
-            optimal_columns["Dance Style"] = {
-                "type": "multi_select",
-                "options": ["Feminine Movement", "Ecstatic Dance", "Contact Improv", "Contemporary", "Tribal", "Belly Dance", "Sacred Dance"]
-            }
-            optimal_columns["Music Style"] = {
-                "type": "multi_select",
-                "options": ["Ambient", "World Music", "Electronic", "Acoustic", "Tribal", "Classical", "Nature Sounds"]
-            }
-            optimal_columns["Space Requirements"] = {
-                "type": "rich_text"
-            }
-            optimal_columns["Props Needed"] = {
-                "type": "multi_select",
-                "options": ["Scarves", "Fans", "Ribbons", "Mirrors", "Candles", "Crystals", "Flowers", "Feathers"]
-            }
-        
-        # Content-based columns
-        if "breathing" in content or "breath" in content:
-            optimal_columns["Breathing Technique"] = {
-                "type": "multi_select",
-                "options": ["Deep Breathing", "Pranayama", "Circular Breathing", "Box Breathing", "Wim Hof", "Holotropic"]
-            }
-        
-        if "energy" in content or "chakra" in content:
-            optimal_columns["Energy Focus"] = {
-                "type": "multi_select",
-                "options": ["Root Chakra", "Sacral Chakra", "Solar Plexus", "Heart Chakra", "Throat Chakra", "Third Eye", "Crown Chakra", "Aura Cleansing"]
-            }
-        
-        if "moon" in content or "lunar" in content:
-            optimal_columns["Moon Phase"] = {
-                "type": "select",
-                "options": ["New Moon", "Waxing Crescent", "First Quarter", "Waxing Gibbous", "Full Moon", "Waning Gibbous", "Last Quarter", "Waning Crescent"]
-            }
-        
-        if "crystal" in content or "healing" in content:
-            optimal_columns["Crystals Used"] = {
-                "type": "multi_select",
-                "options": ["Amethyst", "Rose Quartz", "Clear Quartz", "Citrine", "Black Tourmaline", "Selenite", "Labradorite", "Moonstone"]
-            }
-        
-        # Action-based columns
-        if "collaboration" in action or "partner" in content:
-            optimal_columns["Collaborators"] = {
-                "type": "multi_select",
-                "options": ["Musicians", "Dancers", "Healers", "Artists", "Teachers", "Photographers", "Videographers"]
-            }
-        
-        if "publish" in action or "share" in content:
-            optimal_columns["Publishing Platform"] = {
-                "type": "multi_select",
-                "options": ["Instagram", "YouTube", "Website", "Spotify", "SoundCloud", "Facebook", "TikTok", "Newsletter"]
-            }
-            optimal_columns["Ready to Publish"] = {
-                "type": "checkbox"
-            }
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _determine_optimal_columns(project_type: str, content: str, action: str) -> Mapping[str, Mapping[str, Any]]:
+        """Determine what columns would be optimal for this request.
+
+        Memoised per (project_type, content, action); the result is shared between
+        callers, so it is returned read-only.
+        """
+        fields = {"project_type": project_type, "content": content, "action": action}
+        optimal_columns: Dict[str, Mapping[str, Any]] = {}
+        matched_groups = set()
         
-        # Universal useful columns
-        optimal_columns["Priority Level"] = {
-            "type": "select",
-            "options": ["Low", "Medium", "High", "Urgent"]
-        }
-        optimal_columns["Inspiration Source"] = {
-            "type": "rich_text"
-        }
-        optimal_columns["Next Steps"] = {
-            "type": "rich_text"
-        }
-        optimal_columns["Resources Needed"] = {
-            "type": "multi_select",
-            "options": ["Time", "Money", "Equipment", "Space", "People", "Research", "Practice", "Inspiration"]
-        }
+        for group, triggers, columns in OPTIMAL_COLUMN_RULES:
+            if group in matched_groups:
+                continue
+            if triggers and not any(word in fields[field] for field, word in triggers):
+                continue
+            if group is not None:
+                matched_groups.add(group)
+            optimal_columns.update(columns)
         
-        return optimal_columns
+        return MappingProxyType(optimal_columns)
     
     async def create_project_with_optimal_columns(self, project_data: Dict[str, Any], request_analysis: Dict[str, Any]) -> Optional[Dict]:
         """Create project and optimal columns in one operation"""
         try:
-            # First, analyze and create optimal columns
-            logger.info("Analyzing request for optimal columns...")
-            created_columns = await self.analyze_and_create_optimal_columns(request_analysis)
+            # The new page can go out alongside the column PATCH unless it sets a property
+            # the database does not have yet (the schema read is cached)
+            schema = await self.get_database_schema() or {}
+            page_properties = self._prepare_project_properties(project_data)
+            needs_new_columns = any(name not in schema for name in page_properties)
             
-            if created_columns:
-                logger.info(f"Created {len(created_columns)} optimal columns")
-                
-                # Wait a moment for Notion to process the schema changes
-                import asyncio
-                await asyncio.sleep(2)
+            logger.info("Creating optimal columns and project...")
+            if needs_new_columns:
+                # Notion applies the schema PATCH before responding, so no pause is needed
+                created_columns = await self.analyze_and_create_optimal_columns(request_analysis)
+                project = await self.create_project(project_data)
+            else:
+                created_columns, project = await asyncio.gather(
+                    self.analyze_and_create_optimal_columns(request_analysis),
+                    self.create_project(project_data)
+                )
             
-            # Then create the project with all available data
-            logger.info("Creating project with enhanced data...")
-            project = await self.create_project(project_data)
+            if created_columns:
+                logger.info("Created %s optimal columns", len(created_columns))
             
             return project
             
         except Exception as e:
-            logger.error(f"Error creating project with optimal columns: {e}")
+            logger.error("Error creating project with optimal columns: %s", e)
             return None
 
 
@@ -808,7 +1196,7 @@ class NotionAPI:
             return scored_projects[:limit]
             
         except Exception as e:
-            logger.error(f"Error finding similar projects: {e}")
+            logger.error("Error finding similar projects: %s", e)
             return []
     
     def _calculate_similarity_score(self, project: Dict[str, Any], keywords: List[str]) -> float:
@@ -855,7 +1243,7 @@ class NotionAPI:
             return score
             
         except Exception as e:
-            logger.error(f"Error calculating similarity score: {e}")
+            logger.error("Error calculating similarity score: %s", e)
             return 0.0
     
     def _fuzzy_match(self, keyword: str, text: str) -> bool:
@@ -889,7 +1277,7 @@ class NotionAPI:
             return False
             
         except Exception as e:
-            logger.error(f"Error in fuzzy matching: {e}")
+            logger.error("Error in fuzzy matching: %s", e)
             return False
     
     def format_similar_projects_for_display(self, projects: List[Dict[str, Any]]) -> str:
@@ -898,7 +1286,7 @@ class NotionAPI:
             if not projects:
                 return "No similar projects found."
             
-            formatted = "Found similar projects:\n\n"
+            parts = ["Found similar projects:\n\n"]
             
             for i, project in enumerate(projects, 1):
                 name = project.get('name', 'Untitled')
@@ -907,26 +1295,17 @@ class NotionAPI:
                 score = project.get('similarity_score', 0)
                 
                 # Add emoji for project type
-                type_emojis = {
-                    'Song': '🎵',
-                    'Book': '📖', 
-                    'Course': '🎓',
-                    'Retreat': '🏔️',
-                    'Workshop': '🛠️',
-                    'Album': '💿',
-                    'Project': '📋'
-                }
-                emoji = type_emojis.get(project_type, '📋')
+                emoji = TYPE_EMOJIS.get(project_type, '📋')
                 
-                formatted += f"{i}️⃣ {emoji} **{name}**\n"
-                formatted += f"   Type: {project_type} | Status: {status}\n"
+                parts.append(f"{i}️⃣ {emoji} *{escape_markdown(name, version=1)}*\n")
+                parts.append(f"   Type: {escape_markdown(project_type, version=1)} | Status: {escape_markdown(status, version=1)}\n")
                 if score > 0:
-                    formatted += f"   Match: {score:.1f}\n"
-                formatted += "\n"
+                    parts.append(f"   Match: {score:.1f}\n")
+                parts.append("\n")
             
-            return formatted
+            return "".join(parts)
             
         except Exception as e:
-            logger.error(f"Error formatting similar projects: {e}")
+            logger.error("Error formatting similar projects: %s", e)
             return "Error displaying similar projects."
 
@@ -5,59 +5,185 @@ Processes voice message transcription, intent analysis, and response generation
 
 import asyncio
 import aiohttp
-import json
 import logging
-from typing import Dict, Any, Optional, List
+import orjson
+import re
+import time
+from collections import OrderedDict, defaultdict
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, AsyncIterator, DefaultDict, Mapping
+
+from telegram.helpers import escape_markdown
 
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+RESPONSE_SYSTEM_PROMPT = """
+You are Peruquois' personal assistant — a creative woman, musician, and feminine teacher.
+
+Your tone:
+- Warm, supportive, inspiring
+- Use metaphors of nature, motherhood, creativity
+- Talk about projects as "seeds", "blossoming", "creative flow"
+- Support her multiproject nature as a gift, not a problem
+- Use emojis moderately and meaningfully
+- Write in English (Peruquois' language)
+
+Response types:
+- create_success: project successfully created
+- update_success: project successfully updated
+- general_chat: general communication
+- project_info: information about projects
+
+Keep responses brief but soulful. Max 2–3 sentences.
+"""
+
+RESPONSE_FALLBACK = "I hear you, beautiful soul. Let me help you with that. ✨"
+
+# Emoji used in the plain fallback project listing
+TYPE_EMOJIS: Mapping[str, str] = MappingProxyType({
+    'Song': '🎵',
+    'Book': '📖',
+    'Course': '🎓',
+    'Retreat': '🏔️',
+    'Workshop': '🛠️',
+    'Album': '💿'
+})
+STATUS_EMOJIS: Mapping[str, str] = MappingProxyType({
+    'Idea': '💡',
+    'In Progress': '🔥',
+    'Paused': '⏸️',
+    'Completed': '✅',
+    'Released': '🚀',
+    'Archived': '📦'
+})
+
+# Intent fields read by the bot handlers, with the value used when the model omits them (or sends null)
+INTENT_DEFAULTS: Mapping[str, str] = MappingProxyType({
+    'action': '',
+    'message': '',
+    'project_identifier': '',
+    'project_name': '',
+    'new_status': '',
+    'reason': '',
+    'additional_notes': '',
+    'note_type': 'update',
+    'search_keywords': '',
+    'query_type': '',
+    'reply': '',
+})
+INTENT_DICT_FIELDS = ('project_data', 'updates', 'filters')
+
+
+def _loads_json_reply(content: str) -> Any:
+    """Decode a model JSON reply, tolerating a ```json … ``` code fence around it"""
+    if content.startswith("```"):
+        content = content.strip("`").removeprefix("json").strip()
+    return orjson.loads(content)
+
+
+def normalize_intent(intent: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in every handler-visible intent field once, so handlers can index directly"""
+    normalized = dict(intent)
+    for key, default in INTENT_DEFAULTS.items():
+        if normalized.get(key) is None:
+            normalized[key] = default
+    for key in INTENT_DICT_FIELDS:
+        if not isinstance(normalized.get(key), dict):
+            normalized[key] = {}
+    return normalized
+
+
+def _copy_intent(intent: Dict[str, Any], text: str) -> Dict[str, Any]:
+    """Copy a shared (cached or in-flight) intent for one message; handlers may mutate its dict fields"""
+    copied = {**intent, 'message': text}
+    for key in INTENT_DICT_FIELDS:
+        copied[key] = dict(intent[key])
+    return copied
+
+
 class OpenAIAPI:
     """Class for working with OpenAI API"""
 
-    def __init__(self):
-        self.config = Config()
-        self.base_url = "https://api.openai.com/v1"
-        self.headers = {
-            "Authorization": f"Bearer {self.config.OPENAI_API_KEY}",
-            "Content-Type": "application/json"
-        }
+    # Cache of query_projects intents by normalised message text (they carry no message-specific data)
+    INTENT_CACHE_TTL = 24 * 60 * 60  # seconds
+    INTENT_CACHE_SIZE = 256
+    # Actions whose intent depends only on the wording, so a repeat can reuse it
+    CACHEABLE_INTENT_ACTIONS = frozenset({"query_projects"})
+    # Generated confirmations by (context, response_type); the contexts are short templated strings
+    RESPONSE_CACHE_SIZE = 1024
 
-    async def transcribe_audio(self, audio_file_path: str) -> Optional[str]:
-        """Transcribe an audio file using Whisper API"""
+    def __init__(self, config: Optional[Config] = None, session: Optional[aiohttp.ClientSession] = None):
+        self.config = config or Config.get_instance()
+        self.base_url = "https://api.openai.com/v1"
+        self.headers = self.config.get_openai_headers()
+        self.upload_headers = self.config.get_openai_upload_headers()
+        # Endpoint URLs are fixed, so build them once
+        self._chat_url = f"{self.base_url}/chat/completions"
+        self._transcription_url = f"{self.base_url}/audio/transcriptions"
+        # Shared pooled HTTP session; created lazily if none is injected
+        self.session = session
+        self._intent_cache: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._response_cache: "OrderedDict[tuple[str, str], str]" = OrderedDict()
+        self._intent_inflight: Dict[str, asyncio.Task] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled HTTP session, creating it on first use"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+        return self.session
+
+    async def close(self) -> None:
+        """Close the HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def transcribe_audio(self, audio: bytes | bytearray, filename: str = "audio.ogg") -> Optional[str]:
+        """Transcribe in-memory audio using Whisper API"""
         try:
-            url = f"{self.base_url}/audio/transcriptions"
+            url = self._transcription_url
 
             # Prepare data for multipart/form-data
             data = aiohttp.FormData()
-            data.add_field('file', open(audio_file_path, 'rb'), filename='audio.ogg')
+            data.add_field('file', audio, filename=filename, content_type='audio/ogg')
             data.add_field('model', 'whisper-1')
             data.add_field('language', 'en')  # Peruquois speaks in English
 
-            # Create separate headers without Content-Type for multipart
-            headers = {
-                "Authorization": f"Bearer {self.config.OPENAI_API_KEY}"
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, data=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        transcription = result.get('text', '').strip()
-                        logger.info(f"Transcription: {transcription}")
-                        return transcription
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Transcription error {response.status}: {error_text}")
-                        return None
+            async with self._get_session().post(url, headers=self.upload_headers, data=data) as response:
+                if response.status == 200:
+                    result = orjson.loads(await response.read())
+                    transcription = result.get('text', '').strip()
+                    logger.debug("Transcription: %s", transcription)
+                    return transcription
+                else:
+                    error_text = await response.text()
+                    logger.error("Transcription error %s: %s", response.status, error_text)
+                    return None
 
         except Exception as e:
-            logger.error(f"Error transcribing audio: {e}")
+            logger.error("Error transcribing audio: %s", e)
             return None
 
     async def analyze_intent(self, text: str) -> Optional[Dict[str, Any]]:
-        """Analyze user intent in message"""
+        """Analyze user intent in message (cached for repeated project queries, shared for identical concurrent messages)"""
+        cache_key = " ".join(re.findall(r"\w+", text.casefold()))
+        cached = self._intent_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self.INTENT_CACHE_TTL:
+            self._intent_cache.move_to_end(cache_key)
+            return _copy_intent(cached[1], text)
+
+        task = self._intent_inflight.get(text)
+        if task is None:
+            task = asyncio.create_task(self._analyze_intent(text, cache_key))
+            self._intent_inflight[text] = task
+            task.add_done_callback(lambda _: self._intent_inflight.pop(text, None))
+        # Shielded so one cancelled caller does not cancel the request for the others
+        intent = await asyncio.shield(task)
+        return _copy_intent(intent, text) if intent else None
+
+    async def _analyze_intent(self, text: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Request intent analysis from OpenAI"""
         try:
             system_prompt = """
 You are Peruquois' personal assistant, a creative woman working on many projects.
@@ -143,6 +269,7 @@ Respond ONLY in JSON format:
         "tags": ["new", "tags"]
     },
     "reason": "reason for archiving or status change",
+    "reply": "for create_project - a warm, soulful 1-2 sentence confirmation that the project was saved (nature/creativity metaphors, one emoji at most)",
     "query_type": "by_status|by_type|all",
     "filters": {
         "status": "status to filter by",
@@ -154,66 +281,121 @@ Only include fields relevant to the detected action. For create_project, focus o
 """
             user_prompt = f"Message from Peruquois: {text}"
 
-            response = await self._make_chat_request(system_prompt, user_prompt)
+            # Try the cheaper model first, escalate to the main model when unsure
+            intent_data = await self._request_intent(system_prompt, user_prompt, self.config.OPENAI_INTENT_MODEL)
+            if self.config.OPENAI_INTENT_MODEL != self.config.OPENAI_MODEL and (
+                    intent_data is None or self._intent_confidence(intent_data) < self.config.OPENAI_INTENT_MIN_CONFIDENCE):
+                logger.info("Low-confidence intent, escalating to %s", self.config.OPENAI_MODEL)
+                intent_data = await self._request_intent(system_prompt, user_prompt, self.config.OPENAI_MODEL) or intent_data
 
-            if response:
-                try:
-                    intent_data = json.loads(response)
-                    logger.info(f"Intent analysis: {intent_data}")
-                    return intent_data
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse JSON response: {response}")
-                    return None
-            else:
+            if not intent_data:
                 return None
 
+            intent = normalize_intent(intent_data)
+            if cache_key and intent['action'] in self.CACHEABLE_INTENT_ACTIONS:
+                self._intent_cache[cache_key] = (time.monotonic(), intent)
+                self._intent_cache.move_to_end(cache_key)
+                while len(self._intent_cache) > self.INTENT_CACHE_SIZE:
+                    self._intent_cache.popitem(last=False)
+            return intent
+
         except Exception as e:
-            logger.error(f"Error analyzing intent: {e}")
+            logger.error("Error analyzing intent: %s", e)
             return None
 
-    async def generate_response(self, context: str, response_type: str) -> str:
-        """Generate a response in the style of Peruquois"""
+    async def _request_intent(self, system_prompt: str, user_prompt: str, model: str) -> Optional[Dict[str, Any]]:
+        """Request intent analysis from the given model and parse the JSON reply"""
+        response = await self._make_chat_request(system_prompt, user_prompt, model=model)
+        if not response:
+            return None
         try:
-            system_prompt = """
-You are Peruquois' personal assistant — a creative woman, musician, and feminine teacher.
-
-Your tone:
-- Warm, supportive, inspiring
-- Use metaphors of nature, motherhood, creativity
-- Talk about projects as "seeds", "blossoming", "creative flow"
-- Support her multiproject nature as a gift, not a problem
-- Use emojis moderately and meaningfully
-- Write in English (Peruquois' language)
+            intent_data = _loads_json_reply(response)
+            logger.debug("Intent analysis (%s): %s", model, intent_data)
+            return intent_data if isinstance(intent_data, dict) else None
+        except orjson.JSONDecodeError:
+            logger.error("Failed to parse JSON response: %s", response)
+            return None
 
-Response types:
-- create_success: project successfully created
-- update_success: project successfully updated
-- general_chat: general communication
-- project_info: information about projects
+    @staticmethod
+    def _intent_confidence(intent_data: Dict[str, Any]) -> float:
+        """Read the model-reported confidence, treating missing/invalid values as 0"""
+        try:
+            return float(intent_data.get("confidence", 0))
+        except (TypeError, ValueError):
+            return 0.0
 
-Keep responses brief but soulful. Max 2–3 sentences.
-"""
-            if response_type == "create_success":
-                user_prompt = f"Project created: {context}. Tell Peruquois it was saved."
-            elif response_type == "update_success":
-                user_prompt = f"Project updated: {context}. Let Peruquois know it was updated successfully."
-            elif response_type == "general_chat":
-                user_prompt = f"Peruquois wrote: {context}. Respond warmly and supportively."
-            else:
-                user_prompt = f"Context: {context}. Respond to Peruquois."
+    async def generate_response(self, context: str, response_type: str) -> str:
+        """Generate a response in the style of Peruquois (repeated contexts are served from cache)"""
+        cache_key = (context, response_type)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            self._response_cache.move_to_end(cache_key)
+            return cached
 
-            response = await self._make_chat_request(system_prompt, user_prompt)
+        try:
+            user_prompt = self._build_response_prompt(context, response_type)
+            response = await self._make_chat_request(RESPONSE_SYSTEM_PROMPT, user_prompt)
 
             if response:
-                logger.info(f"Generated response: {response}")
+                logger.debug("Generated response: %s", response)
+                self._response_cache[cache_key] = response
+                if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
                 return response
             else:
-                return "I hear you, beautiful soul. Let me help you with that. ✨"
+                return RESPONSE_FALLBACK
 
         except Exception as e:
-            logger.error(f"Error generating response: {e}")
+            logger.error("Error generating response: %s", e)
             return "Something went wrong, but I'm here for you. Try again, love. 💫"
 
+    async def stream_response(self, context: str, response_type: str) -> AsyncIterator[str]:
+        """Generate a response in the style of Peruquois, yielding text chunks as they arrive (SSE)"""
+        url = self._chat_url
+        data = {
+            "model": self.config.OPENAI_MODEL,
+            "messages": [
+                {"role": "system", "content": RESPONSE_SYSTEM_PROMPT},
+                {"role": "user", "content": self._build_response_prompt(context, response_type)}
+            ],
+            "max_tokens": self.config.OPENAI_MAX_TOKENS,
+            "temperature": self.config.OPENAI_TEMPERATURE,
+            "stream": True
+        }
+
+        try:
+            async with self._get_session().post(url, headers=self.headers, data=orjson.dumps(data)) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error("OpenAI API error %s: %s", response.status, error_text)
+                    return
+
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[len("data:"):].strip()
+                    if payload == "[DONE]":
+                        break
+                    chunk = orjson.loads(payload)["choices"][0]["delta"].get("content")
+                    if chunk:
+                        yield chunk
+
+        except Exception as e:
+            logger.error("Error streaming OpenAI response: %s", e)
+
+    @staticmethod
+    def _build_response_prompt(context: str, response_type: str) -> str:
+        """Build the user prompt for a response of the given type"""
+        if response_type == "create_success":
+            return f"Project created: {context}. Tell Peruquois it was saved."
+        elif response_type == "update_success":
+            return f"Project updated: {context}. Let Peruquois know it was updated successfully."
+        elif response_type == "general_chat":
+            return f"Peruquois wrote: {context}. Respond warmly and supportively."
+        else:
+            return f"Context: {context}. Respond to Peruquois."
+
     async def format_projects_response(self, projects: List[Dict[str, Any]], query_type: str) -> str:
         """Format the response with a list of projects"""
         try:
@@ -246,7 +428,7 @@ Status emojis:
 - Released: 🚀
 - Archived: 📦
 """
-            projects_text = "Projects:\n"
+            lines = ["Projects:"]
             for project in projects:
                 name = project.get('name', 'Untitled')
                 project_type = project.get('type', 'Project')
@@ -254,14 +436,15 @@ Status emojis:
                 date = project.get('date', '')
                 tags = project.get('tags', [])
 
-                projects_text += f"- {name} ({project_type}) - {status}"
+                line = f"- {name} ({project_type}) - {status}"
                 if date:
-                    projects_text += f" - {date}"
+                    line = f"{line} - {date}"
                 if tags:
-                    projects_text += f" - Tags: {', '.join(tags)}"
-                projects_text += "\n"
+                    line = f"{line} - Tags: {', '.join(tags)}"
+                lines.append(line)
+            projects_text = "\n".join(lines)
 
-            user_prompt = f"Format this list of projects beautifully:\n{projects_text}"
+            user_prompt = f"Format this list of projects beautifully:\n{projects_text}\n"
 
             response = await self._make_chat_request(system_prompt, user_prompt)
 
@@ -271,7 +454,7 @@ Status emojis:
                 return self._format_projects_fallback(projects)
 
         except Exception as e:
-            logger.error(f"Error formatting projects: {e}")
+            logger.error("Error formatting projects: %s", e)
             return self._format_projects_fallback(projects)
 
     def _format_projects_fallback(self, projects: List[Dict[str, Any]]) -> str:
@@ -279,76 +462,53 @@ Status emojis:
         if not projects:
             return "No projects found, beautiful. Ready to create something new? ✨"
 
-        message = "🌟 **Your Creative Garden:**\n\n"
-
-        projects_by_type = {}
+        projects_by_type: DefaultDict[str, List[Dict[str, Any]]] = defaultdict(list)
         for project in projects:
-            project_type = project.get('type', 'Other')
-            if project_type not in projects_by_type:
-                projects_by_type[project_type] = []
-            projects_by_type[project_type].append(project)
-
-        type_emojis = {
-            'Song': '🎵',
-            'Book': '📖',
-            'Course': '🎓',
-            'Retreat': '🏔️',
-            'Workshop': '🛠️',
-            'Album': '💿'
-        }
-
-        status_emojis = {
-            'Idea': '💡',
-            'In Progress': '🔥',
-            'Paused': '⏸️',
-            'Completed': '✅',
-            'Released': '🚀',
-            'Archived': '📦'
-        }
+            projects_by_type[project.get('type', 'Other')].append(project)
 
+        parts = ["🌟 *Your Creative Garden:*\n\n"]
         for project_type, type_projects in projects_by_type.items():
-            emoji = type_emojis.get(project_type, '📋')
-            message += f"**{emoji} {project_type}:**\n"
+            emoji = TYPE_EMOJIS.get(project_type, '📋')
+            parts.append(f"*{emoji} {escape_markdown(project_type, version=1)}:*\n")
 
             for project in type_projects:
                 name = project.get('name', 'Untitled')
                 status = project.get('status', 'Unknown')
-                status_emoji = status_emojis.get(status, '📋')
+                status_emoji = STATUS_EMOJIS.get(status, '📋')
 
-                message += f"  {status_emoji} {name}\n"
+                parts.append(f"  {status_emoji} {escape_markdown(name, version=1)}\n")
 
-            message += "\n"
+            parts.append("\n")
 
-        return message
+        return "".join(parts)
 
-    async def _make_chat_request(self, system_prompt: str, user_prompt: str) -> Optional[str]:
+    async def _make_chat_request(self, system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Optional[str]:
         """Perform request to Chat API"""
         try:
-            url = f"{self.base_url}/chat/completions"
+            url = self._chat_url
 
             data = {
-                "model": "gpt-4",
+                "model": model or self.config.OPENAI_MODEL,
                 "messages": [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                "max_tokens": 1000,
-                "temperature": 0.7
+                "max_tokens": self.config.OPENAI_MAX_TOKENS,
+                "temperature": self.config.OPENAI_TEMPERATURE
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=self.headers, json=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        content = result['choices'][0]['message']['content'].strip()
-                        return content
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"OpenAI API error {response.status}: {error_text}")
-                        return None
+            async with self._get_session().post(url, headers=self.headers, data=orjson.dumps(data)) as response:
+                if response.status == 200:
+                    result = orjson.loads(await response.read())
+                    content = result['choices'][0]['message']['content'].strip()
+                    return content
+                else:
+                    error_text = await response.text()
+                    logger.error("OpenAI API error %s: %s", response.status, error_text)
+                    return None
 
         except Exception as e:
-            logger.error(f"Error during OpenAI Chat API request: {e}")
+            logger.error("Error during OpenAI Chat API request: %s", e)
             return None
 
     
@@ -385,17 +545,17 @@ Respond with JSON containing:
 
             if response:
                 try:
-                    column_data = json.loads(response)
-                    logger.info(f"Column analysis: {column_data}")
+                    column_data = _loads_json_reply(response)
+                    logger.debug("Column analysis: %s", column_data)
                     return column_data
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse column analysis JSON: {response}")
+                except orjson.JSONDecodeError:
+                    logger.error("Failed to parse column analysis JSON: %s", response)
                     return {"priority": "low", "recommended_columns": []}
             else:
                 return {"priority": "low", "recommended_columns": []}
 
         except Exception as e:
-            logger.error(f"Error analyzing optimal columns: {e}")
+            logger.error("Error analyzing optimal columns: %s", e)
             return {"priority": "low", "recommended_columns": []}
 
     async def enhanced_intent_analysis(self, text: str) -> Dict[str, Any]:
@@ -405,7 +565,7 @@ Respond with JSON containing:
             intent_analysis = await self.analyze_intent(text)
             
             # Add column analysis for create_project actions
-            if intent_analysis.get("action") == "create_project":
+            if intent_analysis and intent_analysis["action"] == "create_project":
                 logger.info("Analyzing optimal columns for project creation...")
                 column_analysis = await self.analyze_optimal_columns(text)
                 intent_analysis["column_analysis"] = column_analysis
@@ -414,6 +574,6 @@ Respond with JSON containing:
             return intent_analysis
             
         except Exception as e:
-            logger.error(f"Error in enhanced intent analysis: {e}")
+            logger.error("Error in enhanced intent analysis: %s", e)
             return await self.analyze_intent(text)  # Fallback to regular analysis
 
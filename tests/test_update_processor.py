@@ -0,0 +1,68 @@
+"""Tests for per-chat update ordering in PerChatUpdateProcessor"""
+
+import asyncio
+import unittest
+from datetime import datetime, timezone
+
+from telegram import Chat, Message, Update
+
+from main import CONCURRENT_UPDATES, PerChatUpdateProcessor
+
+
+def _update(update_id: int, chat_id: int) -> Update:
+    chat = Chat(id=chat_id, type=Chat.PRIVATE)
+    message = Message(message_id=update_id, date=datetime.now(timezone.utc), chat=chat)
+    return Update(update_id=update_id, message=message)
+
+
+class PerChatUpdateProcessorTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_busy_chat_does_not_hold_slots_of_other_chats(self):
+        processor = PerChatUpdateProcessor(CONCURRENT_UPDATES)
+        release = asyncio.Event()
+        processed = []
+
+        async def handle(update_id: int) -> None:
+            await release.wait()
+            processed.append(update_id)
+
+        # One chat floods more updates than there are concurrency slots
+        busy = [
+            asyncio.create_task(processor.process_update(_update(i, 1), handle(i)))
+            for i in range(CONCURRENT_UPDATES + 10)
+        ]
+        await asyncio.sleep(0)
+
+        other_done = asyncio.Event()
+
+        async def handle_other() -> None:
+            other_done.set()
+
+        other = asyncio.create_task(processor.process_update(_update(10_000, 2), handle_other()))
+        await asyncio.wait_for(other_done.wait(), timeout=1)
+        await other
+
+        release.set()
+        await asyncio.wait_for(asyncio.gather(*busy), timeout=1)
+        self.assertEqual(processed, list(range(CONCURRENT_UPDATES + 10)))
+
+    async def test_updates_of_one_chat_run_one_at_a_time(self):
+        processor = PerChatUpdateProcessor(CONCURRENT_UPDATES)
+        running = 0
+        max_running = 0
+
+        async def handle() -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(*(
+            processor.process_update(_update(i, 1), handle()) for i in range(5)
+        ))
+        self.assertEqual(max_running, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()